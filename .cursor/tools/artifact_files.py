@@ -0,0 +1,362 @@
+#!/usr/bin/env python3
+"""
+Artifact Files
+
+Compression and retention for the markdown artifacts written to .cursor/docs and
+.cursor/chat_summary. Older artifacts are compressed in place (zstd when the
+zstandard package is installed, gzip otherwise) and readers decompress them on
+demand. Retention limits by age, count and total size are applied after writes.
+
+Compression is off unless CURSOR_TOOLS_COMPRESS_AFTER_DAYS is set, and only
+files the tools generated (<name>_<YYYYMMDD_HHMMSS>.md) are ever compressed or
+deleted; hand-written documents in the same directories are left alone.
+
+Examples:
+    # Compress and prune the chat summary directory using the configured policy
+    python artifact_files.py .cursor/chat_summary
+
+    # Keep only the 50 newest research documents
+    python artifact_files.py .cursor/docs --max-count 50
+"""
+
+import os
+import re
+import sys
+import gzip
+import time
+import argparse
+from pathlib import Path
+from typing import Optional, Dict, Any, List
+
+# Ensure the current directory is in the path
+current_dir = Path(__file__).parent
+if str(current_dir) not in sys.path:
+    sys.path.append(str(current_dir))
+
+from tracing import traced
+from runtime_config import setting
+
+# zstandard is optional; gzip from the standard library is used without it
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+ARTIFACT_SUFFIX = ".md"
+COMPRESSED_SUFFIXES = (".zst", ".gz")
+
+# Small files kept next to an artifact and deleted with it, e.g. precomputed digests
+SIDECAR_SUFFIXES = (".digests.json", ".sections.json")
+
+# Compress artifacts older than this many days; None leaves them uncompressed
+DEFAULT_COMPRESS_AFTER_DAYS = None
+
+# Timestamped names written by the tools, e.g. fastapi_20250101_120000.md
+GENERATED_NAME_PATTERN = re.compile(r"_\d{8}_\d{6}\.md$")
+
+
+def is_artifact(path: Path) -> bool:
+    """Return True if the path is a markdown artifact, compressed or not."""
+    name = path.name
+    for suffix in COMPRESSED_SUFFIXES:
+        if name.endswith(ARTIFACT_SUFFIX + suffix):
+            return True
+    return name.endswith(ARTIFACT_SUFFIX)
+
+
+def artifact_name(path: Path) -> str:
+    """Return the markdown filename of an artifact, without any compression suffix."""
+    name = Path(path).name
+    for suffix in COMPRESSED_SUFFIXES:
+        if name.endswith(suffix):
+            return name[:-len(suffix)]
+    return name
+
+
+def is_generated(path: Path) -> bool:
+    """Return True if an artifact was named by the tools rather than written by hand."""
+    return GENERATED_NAME_PATTERN.search(artifact_name(path)) is not None
+
+
+def sidecar_path(path: Path, suffix: str) -> Path:
+    """Return the path of an artifact's sidecar, named after its uncompressed markdown file."""
+    name = artifact_name(path)
+    if name.endswith(ARTIFACT_SUFFIX):
+        name = name[:-len(ARTIFACT_SUFFIX)]
+    return Path(path).with_name(name + suffix)
+
+
+def list_artifacts(directory: Path) -> List[Path]:
+    """
+    List the artifacts in a directory, newest first.
+
+    Args:
+        directory: Directory to scan
+
+    Returns:
+        Paths of markdown artifacts, including compressed ones
+    """
+    directory = Path(directory)
+    if not directory.exists():
+        return []
+    entries = []
+    with os.scandir(directory) as it:
+        for entry in it:
+            if entry.is_file() and is_artifact(Path(entry.name)):
+                entries.append((entry.stat().st_mtime, Path(entry.path)))
+    entries.sort(key=lambda e: e[0], reverse=True)
+    return [path for _, path in entries]
+
+
+def read_artifact(path: Path) -> str:
+    """
+    Read an artifact, decompressing it if needed.
+
+    Args:
+        path: Path to a .md, .md.gz or .md.zst file
+
+    Returns:
+        The markdown content
+    """
+    path = Path(path)
+    if path.name.endswith(".zst"):
+        if zstandard is None:
+            raise RuntimeError(f"Cannot read {path}: install zstandard (pip install zstandard)")
+        with open(path, "rb") as f:
+            data = zstandard.ZstdDecompressor().stream_reader(f).read()
+        return data.decode("utf-8")
+    if path.name.endswith(".gz"):
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            return f.read()
+    with open(path, "r", encoding="utf-8") as f:
+        return f.read()
+
+
+def read_artifact_bytes(path: Path) -> bytes:
+    """Read an artifact's raw bytes, decompressing it if needed (no newline translation)."""
+    path = Path(path)
+    if path.name.endswith(".zst"):
+        if zstandard is None:
+            raise RuntimeError(f"Cannot read {path}: install zstandard (pip install zstandard)")
+        with open(path, "rb") as f:
+            return zstandard.ZstdDecompressor().stream_reader(f).read()
+    if path.name.endswith(".gz"):
+        with gzip.open(path, "rb") as f:
+            return f.read()
+    return path.read_bytes()
+
+
+def resolve_artifact(path: Path) -> Optional[Path]:
+    """
+    Find an artifact by its markdown path, following it if it has since been compressed.
+
+    Args:
+        path: The original .md path
+
+    Returns:
+        The existing path (possibly compressed), or None
+    """
+    path = Path(path)
+    if path.exists():
+        return path
+    for suffix in COMPRESSED_SUFFIXES:
+        candidate = path.with_name(path.name + suffix)
+        if candidate.exists():
+            return candidate
+    return None
+
+
+def default_codec() -> str:
+    """Return the configured compression codec: zstd, gzip or none."""
+    codec = str(setting("CURSOR_TOOLS_COMPRESSION", "retention.codec", "")).strip().lower()
+    if codec in ("zstd", "gzip", "none"):
+        if codec == "zstd" and zstandard is None:
+            return "gzip"
+        return codec
+    return "zstd" if zstandard is not None else "gzip"
+
+
+def compress_artifact(path: Path, codec: Optional[str] = None) -> Path:
+    """
+    Compress an artifact in place, preserving its modification time.
+
+    Args:
+        path: Path to an uncompressed .md file
+        codec: zstd or gzip (defaults to the configured codec)
+
+    Returns:
+        Path of the compressed file
+    """
+    path = Path(path)
+    codec = codec or default_codec()
+    stat = path.stat()
+    data = path.read_bytes()
+    if codec == "zstd":
+        if zstandard is None:
+            raise RuntimeError("zstd compression requires the zstandard package")
+        target = path.with_name(path.name + ".zst")
+        compressed = zstandard.ZstdCompressor(level=10).compress(data)
+    elif codec == "gzip":
+        target = path.with_name(path.name + ".gz")
+        compressed = gzip.compress(data, compresslevel=9)
+    else:
+        return path
+
+    # Write to a temporary file first so an interruption never loses the artifact
+    tmp = target.with_name(target.name + ".tmp")
+    tmp.write_bytes(compressed)
+    os.utime(tmp, (stat.st_atime, stat.st_mtime))
+    os.replace(tmp, target)
+    path.unlink()
+    return target
+
+
+def remove_artifact(path: Path):
+    """Delete an artifact file and its sidecars."""
+    for target in [Path(path)] + [sidecar_path(path, suffix) for suffix in SIDECAR_SUFFIXES]:
+        try:
+            target.unlink()
+        except FileNotFoundError:
+            pass
+
+
+def retention_policy() -> Dict[str, Any]:
+    """
+    Return the configured retention policy.
+
+    Reads CURSOR_TOOLS_COMPRESS_AFTER_DAYS, CURSOR_TOOLS_RETENTION_MAX_AGE_DAYS,
+    CURSOR_TOOLS_RETENTION_MAX_COUNT and CURSOR_TOOLS_RETENTION_MAX_BYTES, or the
+    retention section of the config file.
+    """
+    return {
+        'compress_after_days': setting("CURSOR_TOOLS_COMPRESS_AFTER_DAYS", "retention.compress_after_days",
+                                       DEFAULT_COMPRESS_AFTER_DAYS, float),
+        'max_age_days': setting("CURSOR_TOOLS_RETENTION_MAX_AGE_DAYS", "retention.max_age_days", cast=float),
+        'max_count': setting("CURSOR_TOOLS_RETENTION_MAX_COUNT", "retention.max_count", cast=int),
+        'max_total_bytes': setting("CURSOR_TOOLS_RETENTION_MAX_BYTES", "retention.max_bytes", cast=int),
+    }
+
+
+@traced()
+def apply_retention(
+    directory: Path,
+    compress_after_days: Optional[float] = None,
+    max_age_days: Optional[float] = None,
+    max_count: Optional[int] = None,
+    max_total_bytes: Optional[int] = None,
+    codec: Optional[str] = None,
+    debug: bool = False,
+) -> Dict[str, int]:
+    """
+    Compress older artifacts and prune the directory to the retention limits.
+
+    Only generated artifacts (see is_generated) are considered, and the newest
+    of them is never compressed or deleted. Deletion is applied oldest first:
+    by age, then count, then total size on disk.
+
+    Args:
+        directory: Artifact directory to maintain
+        compress_after_days: Compress artifacts older than this many days
+        max_age_days: Delete artifacts older than this many days
+        max_count: Keep at most this many artifacts
+        max_total_bytes: Keep the directory under this many bytes
+        codec: Compression codec (defaults to the configured codec)
+        debug: Whether to print debug messages
+
+    Returns:
+        Counts of compressed and deleted artifacts
+    """
+    artifacts = [path for path in list_artifacts(directory) if is_generated(path)]
+    now = time.time()
+    compressed = 0
+    deleted = 0
+
+    keep = []
+    for index, path in enumerate(artifacts):
+        stat = path.stat()
+        age_days = (now - stat.st_mtime) / 86400
+        too_old = max_age_days is not None and age_days > max_age_days
+        too_many = max_count is not None and len(keep) >= max_count
+        if index > 0 and (too_old or too_many):
+            remove_artifact(path)
+            deleted += 1
+            if debug:
+                print(f"DEBUG: Deleted artifact: {path.name}")
+            continue
+        keep.append([path, stat.st_size])
+
+    if max_total_bytes is not None:
+        total = sum(size for _, size in keep)
+        while len(keep) > 1 and total > max_total_bytes:
+            path, size = keep.pop()
+            remove_artifact(path)
+            total -= size
+            deleted += 1
+            if debug:
+                print(f"DEBUG: Deleted artifact over size limit: {path.name}")
+
+    codec = codec or default_codec()
+    if compress_after_days is not None and codec != "none":
+        for path, _ in keep[1:]:
+            if path.suffix != ARTIFACT_SUFFIX:
+                continue
+            if (now - path.stat().st_mtime) / 86400 > compress_after_days:
+                target = compress_artifact(path, codec)
+                compressed += 1
+                if debug:
+                    print(f"DEBUG: Compressed artifact: {target.name}")
+
+    return {'compressed': compressed, 'deleted': deleted}
+
+
+def maintain_directory(directory: Path, debug: bool = False) -> Dict[str, int]:
+    """
+    Apply the configured retention policy to a directory after a write.
+
+    Errors are reported in debug mode but never propagate to the caller.
+
+    Args:
+        directory: Artifact directory to maintain
+        debug: Whether to print debug messages
+
+    Returns:
+        Counts of compressed and deleted artifacts
+    """
+    try:
+        return apply_retention(directory, debug=debug, **retention_policy())
+    except Exception as e:
+        if debug:
+            print(f"DEBUG: Retention failed for {directory}: {e}")
+        return {'compressed': 0, 'deleted': 0}
+
+
+#----------------------------------------
+# Command Line Interface
+#----------------------------------------
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compress and prune markdown artifacts")
+    parser.add_argument("directory", help="Artifact directory, e.g. .cursor/docs")
+    parser.add_argument("--compress-after-days", type=float, help="Compress artifacts older than this")
+    parser.add_argument("--max-age-days", type=float, help="Delete artifacts older than this")
+    parser.add_argument("--max-count", type=int, help="Keep at most this many artifacts")
+    parser.add_argument("--max-bytes", type=int, help="Keep the directory under this many bytes")
+    parser.add_argument("--codec", choices=["zstd", "gzip", "none"], help="Compression codec")
+    parser.add_argument("--debug", "-d", action="store_true", help="Enable debug messages")
+    args = parser.parse_args()
+
+    if not Path(args.directory).is_dir():
+        print(f"Directory not found: {args.directory}")
+        sys.exit(1)
+
+    policy = retention_policy()
+    overrides = {
+        'compress_after_days': args.compress_after_days,
+        'max_age_days': args.max_age_days,
+        'max_count': args.max_count,
+        'max_total_bytes': args.max_bytes,
+    }
+    policy.update({k: v for k, v in overrides.items() if v is not None})
+
+    result = apply_retention(args.directory, codec=args.codec, debug=args.debug, **policy)
+    print(f"Compressed {result['compressed']} and deleted {result['deleted']} artifact(s)")
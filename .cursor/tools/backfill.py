@@ -0,0 +1,321 @@
+#!/usr/bin/env python3
+"""
+History Backfill
+
+Summarizes every session in .specstory/history/ that has never been summarized,
+oldest first. Files are tracked in a persistent job queue
+(.cursor/cache/backfill.sqlite3) that is checkpointed after each file, so an
+interrupted run picks up where it stopped. Files whose content hash already has
+a summary are skipped, and progress is reported with throughput and ETA.
+
+Each session summary is written to .cursor/chat_summary/sessions/ as
+session_summary_<history file name>.md and recorded in the store when it is
+enabled. Session summaries don't replace the latest summary shown at startup.
+
+Examples:
+    # Summarize the whole archive with 4 concurrent requests
+    python backfill.py --concurrency 4
+
+    # Show queue status without summarizing anything
+    python backfill.py --status
+
+    # Retry files that failed in an earlier run
+    python backfill.py --retry-failed
+"""
+
+import sys
+import time
+import sqlite3
+import hashlib
+import argparse
+from pathlib import Path
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Optional, Dict, Any, Callable, List
+
+# Ensure the current directory is in the path
+current_dir = Path(__file__).parent
+if str(current_dir) not in sys.path:
+    sys.path.append(str(current_dir))
+
+from chat_summary_tool import find_chat_history_files, ensure_summary_dir, summarize_with_gemini, write_summary
+from generation_backends import CancellationToken, GenerationCancelled
+from summary_store import open_store, KIND_SESSION_SUMMARY
+from runtime_config import find_project_root, get_config, setting
+
+DEFAULT_CONCURRENCY = 2
+
+JOBS_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    path TEXT PRIMARY KEY,
+    mtime REAL NOT NULL,
+    size INTEGER NOT NULL,
+    content_hash TEXT,
+    status TEXT NOT NULL DEFAULT 'pending',
+    summary_path TEXT,
+    error TEXT,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    updated_at REAL
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_status_mtime ON jobs (status, mtime);
+CREATE INDEX IF NOT EXISTS idx_jobs_hash ON jobs (content_hash, status);
+"""
+
+
+def file_hash(path: Path) -> str:
+    """Return the SHA-256 of a file's content, read in blocks."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class BackfillQueue:
+    """Persistent queue of history files and their summarization status."""
+
+    def __init__(self, db_path: Path):
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(db_path))
+        self.conn.executescript(JOBS_SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def sync(self, history_files: List[Path], retry_failed: bool = False) -> int:
+        """
+        Add new history files and requeue files that changed since they were summarized.
+
+        Args:
+            history_files: All history files in the archive
+            retry_failed: Also requeue files that failed before
+
+        Returns:
+            The number of pending jobs
+        """
+        with self.conn:
+            for path in history_files:
+                stat = path.stat()
+                row = self.conn.execute(
+                    "SELECT mtime, size FROM jobs WHERE path = ?", (str(path),)
+                ).fetchone()
+                if row is None:
+                    self.conn.execute(
+                        "INSERT INTO jobs (path, mtime, size) VALUES (?, ?, ?)",
+                        (str(path), stat.st_mtime, stat.st_size),
+                    )
+                elif (row[0], row[1]) != (stat.st_mtime, stat.st_size):
+                    self.conn.execute(
+                        "UPDATE jobs SET mtime = ?, size = ?, content_hash = NULL, status = 'pending', "
+                        "attempts = 0, error = NULL WHERE path = ?",
+                        (stat.st_mtime, stat.st_size, str(path)),
+                    )
+            if retry_failed:
+                self.conn.execute("UPDATE jobs SET status = 'pending', error = NULL WHERE status = 'failed'")
+        return self.count("pending")
+
+    def pending(self) -> List[Path]:
+        """Return pending files, oldest first."""
+        return [Path(r[0]) for r in self.conn.execute(
+            "SELECT path FROM jobs WHERE status = 'pending' ORDER BY mtime, path"
+        )]
+
+    def hash_done(self, content_hash: str) -> bool:
+        """Return True if a file with this content has already been summarized."""
+        return self.conn.execute(
+            "SELECT 1 FROM jobs WHERE content_hash = ? AND status = 'done' LIMIT 1", (content_hash,)
+        ).fetchone() is not None
+
+    def mark(self, path: Path, status: str, content_hash: Optional[str] = None,
+             summary_path: Optional[str] = None, error: Optional[str] = None):
+        """Record the outcome for a file; each call is its own checkpoint."""
+        with self.conn:
+            self.conn.execute(
+                "UPDATE jobs SET status = ?, content_hash = COALESCE(?, content_hash), summary_path = ?, "
+                "error = ?, attempts = attempts + ?, updated_at = ? WHERE path = ?",
+                (status, content_hash, summary_path, error, 0 if status == "skipped" else 1,
+                 time.time(), str(path)),
+            )
+
+    def count(self, status: Optional[str] = None) -> int:
+        if status is None:
+            return self.conn.execute("SELECT COUNT(*) FROM jobs").fetchone()[0]
+        return self.conn.execute("SELECT COUNT(*) FROM jobs WHERE status = ?", (status,)).fetchone()[0]
+
+    def status_counts(self) -> Dict[str, int]:
+        return dict(self.conn.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status"))
+
+
+def default_concurrency() -> int:
+    """Return the configured concurrency (CURSOR_TOOLS_BACKFILL_CONCURRENCY or concurrency.backfill)."""
+    return setting("CURSOR_TOOLS_BACKFILL_CONCURRENCY", "concurrency.backfill", DEFAULT_CONCURRENCY, int)
+
+
+def _format_duration(seconds: float) -> str:
+    seconds = int(seconds)
+    return f"{seconds // 3600:d}:{seconds % 3600 // 60:02d}:{seconds % 60:02d}"
+
+
+def _summarize_file(path: Path, content_hash: str, output_dir: Path, cancel_token: CancellationToken,
+                    debug: bool) -> str:
+    """Summarize one history file and write it; runs on a worker thread."""
+    # Each session is summarized once, so a cached context would never be reused
+    summary = summarize_with_gemini(path, debug=debug, cancel_token=cancel_token, raise_errors=True,
+                                    use_context_cache=False)
+    if not summary.strip():
+        raise RuntimeError("Empty summary returned")
+    output_path = output_dir / f"{KIND_SESSION_SUMMARY}_{path.stem}.md"
+    return write_summary(summary, KIND_SESSION_SUMMARY, output_path=str(output_path), sources=[path],
+                         debug=debug, source_hashes={str(path): content_hash})
+
+
+def backfill_history(
+    concurrency: Optional[int] = None,
+    limit: Optional[int] = None,
+    retry_failed: bool = False,
+    debug: bool = False,
+    cancel_token: Optional[CancellationToken] = None,
+    report: Callable[[str], None] = print,
+) -> Dict[str, Any]:
+    """
+    Summarize every unsummarized session in the history archive.
+
+    Args:
+        concurrency: Maximum number of summaries generated at once (defaults to the configured value)
+        limit: Stop after this many files have been summarized (optional)
+        retry_failed: Requeue files that failed in an earlier run
+        debug: Whether to print debug messages
+        cancel_token: Optional CancellationToken to stop the run early
+        report: Callback receiving progress lines
+
+    Returns:
+        Counts of summarized, skipped and failed files and the elapsed time
+    """
+    cancel_token = cancel_token or CancellationToken()
+    concurrency = max(1, concurrency or default_concurrency())
+    project_root = find_project_root()
+    output_dir = ensure_summary_dir() / "sessions"
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    queue = BackfillQueue(get_config().cache_dir / "backfill.sqlite3")
+    store = open_store(project_root)
+    try:
+        pending_count = queue.sync(find_chat_history_files(), retry_failed=retry_failed)
+        if limit is not None:
+            pending_count = min(pending_count, limit)
+        report(f"Backfill: {pending_count} file(s) to process, concurrency {concurrency}")
+
+        started = time.monotonic()
+        counts = {'done': 0, 'skipped': 0, 'failed': 0}
+        processed = 0
+        in_flight: Dict[Any, Any] = {}
+        pending = deque(queue.pending())
+        hashes: Dict[Path, str] = {}
+
+        def record(future):
+            nonlocal processed
+            path, content_hash = in_flight.pop(future)
+            try:
+                summary_path = future.result()
+            except GenerationCancelled:
+                # Left pending so the next run picks it up
+                return
+            except Exception as e:
+                queue.mark(path, "failed", content_hash=content_hash, error=str(e))
+                counts['failed'] += 1
+                report(f"  failed: {path.name}: {e}")
+            else:
+                queue.mark(path, "done", content_hash=content_hash, summary_path=summary_path)
+                counts['done'] += 1
+            processed += 1
+            elapsed = time.monotonic() - started
+            rate = processed / elapsed if elapsed else 0.0
+            eta = (pending_count - processed) / rate if rate else 0.0
+            report(f"[{processed}/{pending_count}] {path.name} - {rate * 60:.1f} files/min, "
+                   f"ETA {_format_duration(eta)}")
+
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            try:
+                while not cancel_token.cancelled:
+                    # Keep at most `concurrency` jobs in flight
+                    while len(in_flight) < concurrency and (limit is None or counts['done'] + len(in_flight) < limit):
+                        if not pending:
+                            break
+                        path = pending[0]
+                        if not path.exists():
+                            pending.popleft()
+                            queue.mark(path, "skipped", error="File no longer exists")
+                            processed += 1
+                            continue
+                        content_hash = hashes.get(path) or hashes.setdefault(path, file_hash(path))
+                        if any(h == content_hash for _, h in in_flight.values()):
+                            # Same content is being summarized; wait for it, then skip this one
+                            break
+                        pending.popleft()
+                        if queue.hash_done(content_hash) or (store and store.has_source_hash(content_hash)):
+                            queue.mark(path, "skipped", content_hash=content_hash)
+                            counts['skipped'] += 1
+                            processed += 1
+                            if debug:
+                                print(f"DEBUG: Already summarized, skipping: {path.name}")
+                            continue
+                        future = executor.submit(_summarize_file, path, content_hash, output_dir,
+                                                 cancel_token, debug)
+                        in_flight[future] = (path, content_hash)
+                    if not in_flight:
+                        break
+                    done, _ = wait(list(in_flight), timeout=0.5, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        record(future)
+            except KeyboardInterrupt:
+                report("Interrupted; finishing checkpoint. Run again to resume.")
+                cancel_token.cancel()
+            # Record whatever finished while stopping
+            for future in list(in_flight):
+                try:
+                    future.result()
+                except BaseException:
+                    pass
+                record(future)
+
+        elapsed = time.monotonic() - started
+        report(f"Backfill {'stopped' if cancel_token.cancelled else 'complete'}: "
+               f"{counts['done']} summarized, {counts['skipped']} skipped, {counts['failed']} failed "
+               f"in {_format_duration(elapsed)}")
+        return dict(counts, elapsed_seconds=elapsed, remaining=queue.count("pending"))
+    finally:
+        queue.close()
+        if store:
+            store.close()
+
+
+#----------------------------------------
+# Command Line Interface
+#----------------------------------------
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Summarize the whole SpecStory history archive")
+    parser.add_argument("--concurrency", "-c", type=int,
+                        help=f"Concurrent summaries (default: concurrency.backfill in the config file, "
+                             f"or {DEFAULT_CONCURRENCY})")
+    parser.add_argument("--limit", "-n", type=int, help="Stop after summarizing this many files")
+    parser.add_argument("--retry-failed", action="store_true", help="Retry files that failed before")
+    parser.add_argument("--status", action="store_true", help="Show queue status and exit")
+    parser.add_argument("--debug", "-d", action="store_true", help="Enable debug messages")
+    args = parser.parse_args()
+
+    if args.status:
+        status_queue = BackfillQueue(get_config().cache_dir / "backfill.sqlite3")
+        status_queue.sync(find_chat_history_files())
+        for name, count in sorted(status_queue.status_counts().items()):
+            print(f"{name:<8} {count}")
+        status_queue.close()
+        sys.exit(0)
+
+    try:
+        result = backfill_history(concurrency=args.concurrency, limit=args.limit,
+                                  retry_failed=args.retry_failed, debug=args.debug)
+    except FileNotFoundError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+    sys.exit(1 if result['failed'] else 0)
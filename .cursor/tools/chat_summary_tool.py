@@ -16,6 +16,9 @@ Examples:
     # Get the most recent summary
     python chat_summary_tool.py --get
     
+    # Get only the short digest of the most recent summary
+    python chat_summary_tool.py --get --tier short
+    
     # Show debug information
     python chat_summary_tool.py --latest --debug
     
@@ -27,119 +30,34 @@ Examples:
 """
 
 import sys
-import os
 from pathlib import Path
 import datetime
 import argparse
-from typing import Optional, Dict, Any, Union
-
-# Print import debugging only if explicitly enabled
-DEBUG_IMPORTS = bool(os.environ.get("CHAT_SUMMARY_TOOL_DEBUG"))
-if DEBUG_IMPORTS:
-    print("Starting imports...")
-
-# Import Google's generative AI library
-genai = None
-genai_client = None
-types_module = None
-
-try:
-    import google.generativeai as genai
-    if DEBUG_IMPORTS:
-        print("Successfully imported google.generativeai")
-except ImportError as e:
-    if DEBUG_IMPORTS:
-        print(f"Error importing google.generativeai: {e}")
-        print("Google Generative AI package not found. Please install with:")
-        print("pip install google-generativeai")
-    sys.exit(1)
-
-try:
-    from google import genai as genai_client
-    if DEBUG_IMPORTS:
-        print("Successfully imported google.genai as genai_client")
-except ImportError as e:
-    if DEBUG_IMPORTS:
-        print(f"Error importing google.genai: {e}")
-    genai_client = None
-
-try:
-    from google.genai import types as types_module
-    if DEBUG_IMPORTS:
-        print("Successfully imported google.genai.types")
-except ImportError as e:
-    if DEBUG_IMPORTS:
-        print(f"Error importing google.genai.types: {e}")
-    types_module = None
-
-# Try to import dotenv for loading environment variables from .env file
-try:
-    from dotenv import load_dotenv
-    if DEBUG_IMPORTS:
-        print("Successfully imported dotenv")
-except ImportError:
-    if DEBUG_IMPORTS:
-        print("Warning: python-dotenv not found. Environment variables must be set manually.")
-    # Define a simple placeholder if dotenv is not available
-    def load_dotenv(path=None):
-        if DEBUG_IMPORTS:
-            print("Warning: python-dotenv not found. Environment variables must be set manually.")
-        return False
+from typing import Optional, Dict, Any, Union, Iterable, Sequence
+
+# Ensure the current directory is in the path
+current_dir = Path(__file__).parent
+if str(current_dir) not in sys.path:
+    sys.path.append(str(current_dir))
+
+from tracing import span, traced
+
+with span("imports", module="chat_summary_tool"):
+    from summary_store import open_store, KIND_CHAT_SUMMARY, KIND_MULTI_CHAT_SUMMARY
+    from artifact_files import list_artifacts, maintain_directory
+    from generation_backends import (
+        get_backend, backend_requires_api_key, CancellationToken, GenerationCancelled, GenerationTimeout
+    )
+    from context_cache import get_context_cache, context_cache_enabled
+    from specstory_parser import Message, load_messages, render_transcript
+    from summary_digests import TIERS, build_digests, write_digests, read_tier, startup_tier, digest_mode
+    from runtime_config import find_project_root, load_api_key, get_config, setting
 
 #----------------------------------------
 # Utility Functions
 #----------------------------------------
 
-def find_project_root() -> Path:
-    """
-    Find the project root directory (where .cursor is or should be).
-    Starts from the current directory and moves up until it finds .cursor
-    or returns the home directory as a fallback.
-    """
-    # Start with the current working directory
-    current_dir = Path.cwd()
-    
-    # Check if we're already in the .cursor/tools directory
-    if current_dir.name == "tools" and current_dir.parent.name == ".cursor":
-        return current_dir.parent.parent
-    
-    # Look for .cursor directory by walking up
-    for path in [current_dir] + list(current_dir.parents):
-        if (path / ".cursor").exists():
-            return path
-    
-    # Fallback: Use home directory
-    return Path.home()
-
-def load_api_key() -> Optional[str]:
-    """
-    Load the Gemini API key from environment variables or .env file.
-    
-    Returns:
-        The API key if found, None otherwise
-    """
-    # First check if the key is already in environment variables
-    api_key = os.environ.get("GEMINI_API_KEY") or os.environ.get("GOOGLE_API_KEY")
-    if api_key:
-        return api_key
-        
-    # If not, try to load from .env file
-    # Find the project root
-    project_root = find_project_root()
-    
-    # Path to the .env file
-    env_path = project_root / ".env"
-    
-    # Check if the .env file exists
-    if env_path.exists():
-        # Load the .env file
-        load_dotenv(dotenv_path=env_path)
-        
-        # Get the API key
-        api_key = os.environ.get("GEMINI_API_KEY") or os.environ.get("GOOGLE_API_KEY")
-    
-    return api_key
-
+@traced()
 def find_chat_history_files() -> list[Path]:
     """
     Find all chat history files in .specstory/history/
@@ -147,9 +65,7 @@ def find_chat_history_files() -> list[Path]:
     Returns:
         List of paths to chat history files sorted by modification time (newest first)
     """
-    # Find the project root
-    project_root = find_project_root()
-    history_dir = project_root / ".specstory" / "history"
+    history_dir = get_config().history_dir
     
     # Check if the history directory exists
     if not history_dir.exists():
@@ -178,6 +94,19 @@ def read_chat_history(file_path: Path) -> str:
     with open(file_path, "r", encoding="utf-8") as f:
         return f.read()
 
+def load_history_messages(file_path: Path) -> Sequence[Message]:
+    """
+    Parse a chat history file into messages, using the on-disk parse cache
+    
+    Args:
+        file_path: Path to the chat history file
+        
+    Returns:
+        Messages with roles, timestamps and byte spans
+    """
+    cache_dir = get_config().cache_dir / "specstory"
+    return load_messages(file_path, cache_dir=cache_dir)
+
 def ensure_summary_dir() -> Path:
     """
     Ensure the chat summary directory exists
@@ -185,88 +114,220 @@ def ensure_summary_dir() -> Path:
     Returns:
         Path to the chat summary directory
     """
-    project_root = find_project_root()
-    summary_dir = project_root / ".cursor" / "chat_summary"
+    summary_dir = get_config().summary_dir
     summary_dir.mkdir(parents=True, exist_ok=True)
     return summary_dir
 
+@traced()
+def write_summary(
+    summary: str,
+    kind: str,
+    output_path: Optional[str] = None,
+    sources: Iterable[Path] = (),
+    debug: bool = False,
+    source_hashes: Optional[Dict[str, str]] = None,
+) -> str:
+    """
+    Write a summary to disk and record it in the store when enabled.
+    
+    Args:
+        summary: The summary content
+        kind: Artifact kind, also used as the filename prefix
+        output_path: Optional specific path to save the summary
+        sources: Chat history files the summary was generated from
+        debug: Whether to print debug messages
+        source_hashes: Content hashes of the sources, keyed by path
+        
+    Returns:
+        Path of the written markdown file
+    """
+    if output_path:
+        summary_path = output_path
+    else:
+        # Generate a filename with timestamp
+        timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+        filename = f"{kind}_{timestamp}.md"
+        summary_dir = ensure_summary_dir()
+        summary_path = str(summary_dir / filename)
+    
+    # Write the summary to file
+    with open(summary_path, "w", encoding="utf-8") as f:
+        f.write(summary)
+    if debug:
+        print(f"DEBUG: Wrote summary to file: {summary_path}")
+    
+    # Precompute the shorter tiers once, so readers never have to
+    digests = build_digests(summary, generate=_generate_digest if digest_mode() == "model" else None,
+                            debug=debug)
+    # Sidecars only go next to summaries in the managed directory, never next to a caller's file
+    if Path(summary_path).resolve().is_relative_to(get_config().summary_dir.resolve()):
+        write_digests(Path(summary_path), digests)
+    
+    # Compress and prune older summaries in the default directory
+    if not output_path:
+        result = maintain_directory(summary_dir, debug=debug)
+        if debug and (result['compressed'] or result['deleted']):
+            print(f"DEBUG: Retention compressed {result['compressed']}, deleted {result['deleted']}")
+    
+    # Index the summary so lookups don't need to scan the directory
+    store = open_store(find_project_root())
+    if store:
+        with store:
+            artifact_id = store.add(kind, summary, topic="Chat History Summary", sources=sources,
+                                    export_path=summary_path, source_hashes=source_hashes, digests=digests)
+            pruned = store.apply_retention()
+        if debug:
+            print(f"DEBUG: Stored summary as artifact {artifact_id}, pruned {pruned}")
+    
+    return summary_path
+
+def _generate_digest(summary: str, max_tokens: int) -> str:
+    """Condense a summary with the reduce backend (used when CURSOR_TOOLS_DIGESTS=model)."""
+    backend = get_backend("reduce", api_key=load_api_key())
+    prompt = f"""Condense the following chat summary to at most {max_tokens * 3 // 4} words of markdown.
+Keep the overview, key decisions, open issues and next steps; drop code and minor detail.
+Reply with the condensed summary only.
+
+{summary}"""
+    return backend.generate(prompt)
+
+@traced()
+def has_summaries() -> bool:
+    """
+    Check whether any chat summary exists, using the store index when enabled.
+    
+    Returns:
+        True if at least one summary exists
+    """
+    store = open_store(find_project_root())
+    if store:
+        with store:
+            if store.latest() is not None:
+                return True
+    return bool(list_artifacts(ensure_summary_dir()))
+
 #----------------------------------------
-# Gemini Integration
+# Generation Backend Integration
 #----------------------------------------
 
+# Stable instructions, kept separate from the content so both can be cached
+SUMMARY_REQUIREMENTS = """Your summary should be structured in markdown format and include:
+1. Main topics and questions discussed
+2. Key decisions made
+3. Code changes implemented or solutions provided
+4. Technical problems solved
+5. Architecture and design choices
+6. Any ongoing issues or next steps identified
+
+Focus on technical details that would be most valuable for a new agent session.
+Include relevant code snippets, file names, and technical concepts if mentioned.
+Format the summary with clear sections and bullet points for readability.
+
+Start with a brief overview paragraph followed by well-organized sections.
+"""
+
+SUMMARY_INSTRUCTIONS = f"""Task: Analyze the provided Cursor AI chat history and create a comprehensive summary.
+
+{SUMMARY_REQUIREMENTS}"""
+
+# Maximum characters of chat history sent for one summary
+MAX_CONTENT_CHARS = 10000
+
+# Content shorter than this is sent inline rather than as a cached context
+DEFAULT_CONTEXT_CACHE_MIN_CHARS = 4000
+
+def context_cache_min_chars() -> int:
+    """Return the minimum content size for context caching (CURSOR_TOOLS_CONTEXT_CACHE_MIN_CHARS)."""
+    return setting("CURSOR_TOOLS_CONTEXT_CACHE_MIN_CHARS", "cache.context_min_chars",
+                   DEFAULT_CONTEXT_CACHE_MIN_CHARS, int)
+
+@traced()
 def summarize_with_gemini(
     content: Union[str, Path],
     topic: str = "Chat History Summary",
-    model: str = "gemini-2.5-pro-exp-03-25",
+    model: Optional[str] = None,
     debug: bool = False,
+    task: str = "summarize",
+    first_chunk_timeout: Optional[float] = None,
+    total_timeout: Optional[float] = None,
+    cancel_token: Optional[CancellationToken] = None,
+    use_context_cache: bool = True,
+    raise_errors: bool = False,
 ) -> str:
     """
-    Generate a summary using Gemini.
+    Generate a summary using the backend routed for the task (Gemini by default).
     
     Args:
         content: Text content to summarize or Path to a file
         topic: Topic of the summary
-        model: Gemini model to use
+        model: Model to use (defaults to the configured model; non-Gemini backends use their own)
         debug: Whether to print debug messages
+        task: Backend route to use (summarize or reduce)
+        first_chunk_timeout: Seconds to wait for the first chunk (defaults to the configured deadline)
+        total_timeout: Seconds allowed for the whole summary (defaults to the configured deadline)
+        cancel_token: Optional CancellationToken to stop generation early
+        use_context_cache: Whether large content may be sent as a cached context
+        raise_errors: Raise generation errors instead of returning an error message
         
     Returns:
         The generated summary as a string
+        
+    Raises:
+        GenerationTimeout: A deadline was missed
+        GenerationCancelled: The generation was cancelled
     """
-    # Get API key (with debugging)
+    # Get API key (with debugging); local and offline backends don't need one
     api_key = load_api_key()
-    if not api_key:
+    if not api_key and backend_requires_api_key(task):
         # Provide debug info
         if debug:
             print("DEBUG: No API key found in environment or .env")
             print("  - Checked env vars: GEMINI_API_KEY, GOOGLE_API_KEY")
-            print("  - Checked .env file at project root")
-        
-        # Use a fallback API key or provide instructions
-        try:
-            # Try to get it directly from .env file
-            env_path = find_project_root() / ".env"
-            if env_path.exists():
-                with open(env_path, "r") as f:
-                    for line in f:
-                        if line.startswith("GEMINI_API_KEY="):
-                            api_key = line.strip().split("=", 1)[1].strip('"\'')
-                            if debug:
-                                print(f"DEBUG: Found key in .env directly")
-                            break
-        except Exception as e:
-            if debug:
-                print(f"DEBUG: Error reading .env directly: {e}")
-                
-        if not api_key:
-            # Still no key found, provide clear error message
-            raise ValueError("No Gemini API key found. Please set GEMINI_API_KEY in your environment or .env file.")
+            print(f"  - Checked .env file at project root: {get_config().root}")
+        raise ValueError("No Gemini API key found. Please set GEMINI_API_KEY in your environment or .env file.")
     
-    # Initialize the Gemini client using the legacy API that's available
+    # Initialize the backend routed for this task
+    backend = get_backend(task, model=model, api_key=api_key)
     if debug:
-        print(f"DEBUG: Using Gemini API with model: {model}")
-    
-    genai.configure(api_key=api_key)
+        print(f"DEBUG: Using backend: {backend.describe()}")
     
     # Determine if we're working with a file path or text content
     is_file = isinstance(content, Path)
     
-    # If it's a file, read the content
+    # If it's a file, build a compact transcript from its parsed messages
     if is_file:
         if debug:
             print(f"DEBUG: Reading file content: {content}")
-        with open(content, "r", encoding="utf-8") as f:
-            file_content = f.read()
-        content_preview = file_content[:10000]  # First 10000 chars
-        if len(file_content) > 10000:
-            content_preview += f"\n\n[...truncated - total length: {len(file_content)} characters]"
+        with span("render_transcript") as trace:
+            messages = load_history_messages(content)
+            content_preview = render_transcript(content, messages, max_chars=MAX_CONTENT_CHARS)
+            trace.set(messages=len(messages), chars=len(content_preview))
+        if debug:
+            print(f"DEBUG: Parsed {len(messages)} messages into {len(content_preview)} chars")
     else:
         # Create a condensed version of the content if it's too long
-        content_preview = content[:10000]  # First 10000 chars
-        if len(content) > 10000:
+        content_preview = content[:MAX_CONTENT_CHARS]
+        if len(content) > MAX_CONTENT_CHARS:
             content_preview += f"\n\n[...truncated - total length: {len(content)} characters]"
     
-    # Build the prompt text
-    prompt = f"""Today is: {datetime.date.today()}
+    # Large content is registered as a cached context so repeated passes over the
+    # same history only send the short per-request prompt
+    cached_context = None
+    if use_context_cache and context_cache_enabled() and len(content_preview) >= context_cache_min_chars():
+        with span("context_cache") as trace:
+            cached_context = get_context_cache(find_project_root()).get_or_create(
+                backend,
+                f"CONTENT TO SUMMARIZE:\n```\n{content_preview}\n```",
+                system_instruction=SUMMARY_INSTRUCTIONS,
+                debug=debug,
+            )
+            trace.set(remote=cached_context.remote)
+        prompt = f"""Today is: {datetime.date.today()}
+
+Summarize the chat history in the content above, following the instructions."""
+    else:
+        # Build the prompt text
+        prompt = f"""Today is: {datetime.date.today()}
     
 Task: Analyze the provided Cursor AI chat history and create a comprehensive summary.
 
@@ -275,36 +336,26 @@ CONTENT TO SUMMARIZE:
 {content_preview}
 ```
 
-Your summary should be structured in markdown format and include:
-1. Main topics and questions discussed
-2. Key decisions made
-3. Code changes implemented or solutions provided
-4. Technical problems solved
-5. Architecture and design choices
-6. Any ongoing issues or next steps identified
+{SUMMARY_REQUIREMENTS}"""
 
-Focus on technical details that would be most valuable for a new agent session.
-Include relevant code snippets, file names, and technical concepts if mentioned.
-Format the summary with clear sections and bullet points for readability.
-
-Start with a brief overview paragraph followed by well-organized sections.
-"""
-
-    # Setup the model and generate with streaming
-    model_obj = genai.GenerativeModel(model_name=model)
     if debug:
-        print(f"DEBUG: Created model, generating content...")
+        print(f"DEBUG: Generating content...")
     
     # Generate content with streaming to handle larger outputs
     all_text = ""
     
     try:
         # Stream the response
-        response = model_obj.generate_content(prompt, stream=True)
-        for chunk in response:
-            if hasattr(chunk, 'text') and chunk.text:
-                all_text += chunk.text
+        for text in backend.stream(prompt, first_chunk_timeout=first_chunk_timeout,
+                                   total_timeout=total_timeout, cancel_token=cancel_token,
+                                   cached_context=cached_context):
+            all_text += text
+    except (GenerationCancelled, GenerationTimeout):
+        # Let callers see these rather than saving an error message as a summary
+        raise
     except Exception as e:
+        if raise_errors:
+            raise
         if debug:
             print(f"DEBUG: Error during content generation: {str(e)}")
             import traceback
@@ -312,7 +363,7 @@ Start with a brief overview paragraph followed by well-organized sections.
         return f"Error generating summary: {str(e)}"
     
     if not all_text and debug:
-        print("DEBUG: No response text received from Gemini")
+        print("DEBUG: No response text received from the backend")
     
     return all_text
 
@@ -320,13 +371,23 @@ Start with a brief overview paragraph followed by well-organized sections.
 # Core Functionality
 #----------------------------------------
 
-def summarize_latest_chat(output_path: Optional[str] = None, debug: bool = False) -> str:
+@traced()
+def summarize_latest_chat(
+    output_path: Optional[str] = None,
+    debug: bool = False,
+    first_chunk_timeout: Optional[float] = None,
+    total_timeout: Optional[float] = None,
+    cancel_token: Optional[CancellationToken] = None,
+) -> str:
     """
     Summarize the latest chat history and save to the specified location or default.
     
     Args:
         output_path: Optional specific path to save the summary
         debug: Whether to print debug messages
+        first_chunk_timeout: Seconds to wait for the first chunk (defaults to the configured deadline)
+        total_timeout: Seconds allowed for the whole summary (defaults to the configured deadline)
+        cancel_token: Optional CancellationToken to stop generation early
         
     Returns:
         The summary content and save location
@@ -338,25 +399,14 @@ def summarize_latest_chat(output_path: Optional[str] = None, debug: bool = False
             print(f"DEBUG: Found latest chat history file: {latest_file.name}")
         
         # Generate the summary using the file directly
-        summary = summarize_with_gemini(latest_file, debug=debug)
+        summary = summarize_with_gemini(latest_file, debug=debug, first_chunk_timeout=first_chunk_timeout,
+                                        total_timeout=total_timeout, cancel_token=cancel_token)
         if debug:
             print(f"DEBUG: Generated summary, size: {len(summary)} chars")
         
-        # Save to file if needed
-        if output_path:
-            summary_path = output_path
-        else:
-            # Generate a filename with timestamp
-            timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = f"chat_summary_{timestamp}.md"
-            summary_dir = ensure_summary_dir()
-            summary_path = str(summary_dir / filename)
-        
-        # Write the summary to file
-        with open(summary_path, "w", encoding="utf-8") as f:
-            f.write(summary)
-        if debug:
-            print(f"DEBUG: Wrote summary to file: {summary_path}")
+        # Save to file and index it
+        summary_path = write_summary(summary, KIND_CHAT_SUMMARY, output_path=output_path,
+                                     sources=[latest_file], debug=debug)
         
         return f"Chat history summary saved to: {summary_path}\n\n{summary}"
     except Exception as e:
@@ -366,7 +416,15 @@ def summarize_latest_chat(output_path: Optional[str] = None, debug: bool = False
             traceback.print_exc()
         return f"Error summarizing chat history: {str(e)}"
 
-def summarize_recent_chats(count: int = 3, output_path: Optional[str] = None, debug: bool = False) -> str:
+@traced()
+def summarize_recent_chats(
+    count: int = 3,
+    output_path: Optional[str] = None,
+    debug: bool = False,
+    first_chunk_timeout: Optional[float] = None,
+    total_timeout: Optional[float] = None,
+    cancel_token: Optional[CancellationToken] = None,
+) -> str:
     """
     Summarize the most recent chat histories and save to a single file.
     
@@ -374,6 +432,9 @@ def summarize_recent_chats(count: int = 3, output_path: Optional[str] = None, de
         count: Number of recent chat history files to summarize
         output_path: Optional specific path to save the summary
         debug: Whether to print debug messages
+        first_chunk_timeout: Seconds to wait for the first chunk (defaults to the configured deadline)
+        total_timeout: Seconds allowed for the whole summary (defaults to the configured deadline)
+        cancel_token: Optional CancellationToken to stop generation early
         
     Returns:
         The summary content and save location
@@ -384,64 +445,36 @@ def summarize_recent_chats(count: int = 3, output_path: Optional[str] = None, de
         if debug:
             print(f"DEBUG: Found {len(recent_files)} recent chat history files")
         
-        # For multiple files, we need to combine them with text markers
-        # as the file upload approach can only handle one file at a time
+        # For multiple files, combine compact transcripts of each session,
+        # giving every session an equal share of the content budget
         if len(recent_files) > 1:
-            # Create a temporary combined file
-            temp_dir = Path(os.path.join(find_project_root(), ".cursor", "temp"))
-            temp_dir.mkdir(parents=True, exist_ok=True)
-            temp_file = temp_dir / f"combined_chats_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}.md"
-            
-            # Combine all content with clear markers
-            with open(temp_file, "w", encoding="utf-8") as f:
-                for i, file_path in enumerate(recent_files):
-                    content = read_chat_history(file_path)
-                    if debug:
-                        print(f"DEBUG: Read chat history {i+1}: {file_path.name} ({len(content)} chars)")
-                    f.write(f"### Chat Session {i+1}: {file_path.name}\n\n{content}\n\n")
-                    if i < len(recent_files) - 1:
-                        f.write("\n\n---\n\n")
-            
-            if debug:
-                print(f"DEBUG: Created temporary combined file: {temp_file}")
-            
-            # Use the combined file for summarization
-            summary = summarize_with_gemini(temp_file, debug=debug)
-            
-            # Clean up the temporary file
-            try:
-                if os.path.exists(temp_file):
-                    os.remove(temp_file)
-                    if debug:
-                        print(f"DEBUG: Removed temporary file: {temp_file}")
-            except Exception as e:
+            budget = MAX_CONTENT_CHARS // len(recent_files)
+            sections = []
+            for i, file_path in enumerate(recent_files):
+                messages = load_history_messages(file_path)
+                transcript = render_transcript(file_path, messages, max_chars=budget)
                 if debug:
-                    print(f"DEBUG: Failed to remove temporary file: {e}")
+                    print(f"DEBUG: Parsed chat history {i+1}: {file_path.name} "
+                          f"({len(messages)} messages, {len(transcript)} chars)")
+                sections.append(f"### Chat Session {i+1}: {file_path.name}\n\n{transcript}\n\n")
+            combined = "\n\n---\n\n".join(sections)
+            
+            summary = summarize_with_gemini(combined, debug=debug, first_chunk_timeout=first_chunk_timeout,
+                                            total_timeout=total_timeout, cancel_token=cancel_token)
         else:
             # For a single file, use it directly
             file_path = recent_files[0]
             if debug:
                 print(f"DEBUG: Using single file: {file_path.name}")
-            summary = summarize_with_gemini(file_path, debug=debug)
+            summary = summarize_with_gemini(file_path, debug=debug, first_chunk_timeout=first_chunk_timeout,
+                                            total_timeout=total_timeout, cancel_token=cancel_token)
         
         if debug:
             print(f"DEBUG: Generated summary, size: {len(summary)} chars")
         
-        # Save to file if needed
-        if output_path:
-            summary_path = output_path
-        else:
-            # Generate a filename with timestamp
-            timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = f"multi_chat_summary_{timestamp}.md"
-            summary_dir = ensure_summary_dir()
-            summary_path = str(summary_dir / filename)
-        
-        # Write the summary to file
-        with open(summary_path, "w", encoding="utf-8") as f:
-            f.write(summary)
-        if debug:
-            print(f"DEBUG: Wrote summary to file: {summary_path}")
+        # Save to file and index it
+        summary_path = write_summary(summary, KIND_MULTI_CHAT_SUMMARY, output_path=output_path,
+                                     sources=recent_files, debug=debug)
         
         return f"Multi-chat summary saved to: {summary_path}\n\n{summary}"
     except Exception as e:
@@ -451,42 +484,65 @@ def summarize_recent_chats(count: int = 3, output_path: Optional[str] = None, de
             traceback.print_exc()
         return f"Error summarizing recent chat histories: {str(e)}"
 
-def get_latest_summary(debug: bool = False) -> str:
+def _tier_label(name: str, tier: str) -> str:
+    """Return the heading for a summary tier, pointing at the deeper tiers."""
+    if tier == "full":
+        return f"Latest chat summary ({name}):"
+    return (f"Latest chat summary ({name}, {tier} digest; "
+            f"run chat_summary_tool.py --get --tier full for the full summary):")
+
+@traced()
+def get_latest_summary(
+    debug: bool = False,
+    cancel_token: Optional[CancellationToken] = None,
+    tier: str = "full",
+) -> str:
     """
     Get the most recent chat summary from .cursor/chat_summary/
     
     Args:
         debug: Whether to print debug messages
+        cancel_token: Optional CancellationToken, used if a new summary has to be generated
+        tier: short, medium or full; summaries written without digests are returned in full
     
     Returns:
         Content of the most recent chat summary
     """
     try:
+        # Prefer the indexed store when it is enabled
+        store = open_store(find_project_root())
+        if store:
+            with store:
+                record = store.latest_digest(tier)
+            if record:
+                name = Path(record['export_path']).name if record['export_path'] else f"artifact {record['id']}"
+                if debug:
+                    print(f"DEBUG: Found latest summary in store: {name} ({record['tier']})")
+                return f"{_tier_label(name, record['tier'])}\n\n{record['content']}"
+        
         # Ensure summary directory exists
         summary_dir = ensure_summary_dir()
         
-        # Find all markdown files in the summary directory
-        summary_files = list(summary_dir.glob("*.md"))
+        # Find all summaries in the directory, newest first (including compressed ones)
+        summary_files = list_artifacts(summary_dir)
         
         # If no summary files found, generate one
         if not summary_files:
             if debug:
                 print("DEBUG: No existing summaries found")
             print("No existing summaries found. Generating a new one...")
-            return summarize_latest_chat(debug=debug)
+            return summarize_latest_chat(debug=debug, cancel_token=cancel_token)
         
-        # Sort by modification time, newest first
-        latest_file = max(summary_files, key=lambda p: p.stat().st_mtime)
+        latest_file = summary_files[0]
         if debug:
             print(f"DEBUG: Found latest summary: {latest_file.name}")
         
-        # Read the content
-        with open(latest_file, "r", encoding="utf-8") as f:
-            content = f.read()
+        # Read the requested tier, decompressing the full summary if needed
+        content, tier = read_tier(latest_file, tier)
         if debug:
-            print(f"DEBUG: Read summary, size: {len(content)} chars")
+            print(f"DEBUG: Read {tier} summary, size: {len(content)} chars")
         
-        return f"Latest chat summary ({latest_file.name}):\n\n{content}"
+        return f"{_tier_label(latest_file.name, tier)}\n\n{content}"
     except Exception as e:
         print(f"Error retrieving latest summary: {str(e)}")
         if debug:
@@ -494,31 +550,45 @@ def get_latest_summary(debug: bool = False) -> str:
             traceback.print_exc()
         return f"Error retrieving latest summary: {str(e)}"
 
-def startup_summary(debug: bool = False):
+@traced()
+def startup_summary(
+    debug: bool = False,
+    cancel_token: Optional[CancellationToken] = None,
+    tier: Optional[str] = None,
+):
     """
     Function to run at agent startup - get or generate summary
     
     Args:
         debug: Whether to print debug messages
+        cancel_token: Optional CancellationToken to abandon summary generation
+        tier: Summary tier to print (defaults to CURSOR_TOOLS_STARTUP_TIER, or short)
     """
     print("\n=== AGENT SESSION STARTUP ===\n")
     
+    cancel_token = cancel_token or CancellationToken()
+    tier = tier or startup_tier()
     try:
         # Try to get existing summary or generate new one
-        summary_dir = ensure_summary_dir()
-        summary_files = list(summary_dir.glob("*.md"))
-        
-        if summary_files:
+        if has_summaries():
             # Get the latest summary
             if debug:
                 print("DEBUG: Found existing summaries, getting latest")
-            print(get_latest_summary(debug=debug))
+            print(get_latest_summary(debug=debug, cancel_token=cancel_token, tier=tier))
         else:
             # Generate a new summary
             if debug:
                 print("DEBUG: No existing summaries found")
             print("No existing summaries found. Generating a new one...")
-            print(summarize_latest_chat(debug=debug))
+            result = summarize_latest_chat(debug=debug, cancel_token=cancel_token)
+            if tier != "full" and has_summaries():
+                # Show the digest of the summary just written rather than all of it
+                result = get_latest_summary(debug=debug, tier=tier)
+            print(result)
+    except KeyboardInterrupt:
+        # Stop the in-flight generation so it doesn't keep consuming quota
+        cancel_token.cancel()
+        print("Startup summary cancelled.")
     except Exception as e:
         print(f"Error during startup: {str(e)}")
         if debug:
@@ -544,22 +614,30 @@ if __name__ == "__main__":
     # Additional options
     parser.add_argument("--output", "-o", help="Output file path for the summary")
     parser.add_argument("--debug", "-d", action="store_true", help="Enable debug messages")
+    parser.add_argument("--first-chunk-timeout", type=float, help="Seconds to wait for the first chunk (0 disables)")
+    parser.add_argument("--total-timeout", type=float, help="Seconds allowed for the whole summary (0 disables)")
+    parser.add_argument("--tier", "-t", choices=TIERS,
+                        help="Summary tier for --get and --startup (default: full for --get, short for startup)")
     
     args = parser.parse_args()
+    timeouts = {'first_chunk_timeout': args.first_chunk_timeout, 'total_timeout': args.total_timeout}
     
     try:
         # Handle actions based on arguments
         if args.latest:
-            print(summarize_latest_chat(output_path=args.output, debug=args.debug))
+            print(summarize_latest_chat(output_path=args.output, debug=args.debug, **timeouts))
         elif args.recent is not None:
-            print(summarize_recent_chats(count=args.recent, output_path=args.output, debug=args.debug))
+            print(summarize_recent_chats(count=args.recent, output_path=args.output, debug=args.debug, **timeouts))
         elif args.get:
-            print(get_latest_summary(debug=args.debug))
+            print(get_latest_summary(debug=args.debug, tier=args.tier or "full"))
         elif args.startup:
-            startup_summary(debug=args.debug)
+            startup_summary(debug=args.debug, tier=args.tier)
         else:
             # Default to startup if no arguments provided
-            startup_summary(debug=args.debug)
+            startup_summary(debug=args.debug, tier=args.tier)
+    except KeyboardInterrupt:
+        print("\nCancelled.")
+        sys.exit(130)
     except Exception as e:
         print(f"Error: {str(e)}")
         if args.debug:
@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""
+Generation Checkpoints
+
+Partial output of long generations is written to .cursor/checkpoints/ as it
+streams, keyed by a hash of the request. When a stream dies (network reset,
+quota error, Ctrl-C) the next run with resume enabled sends a continuation
+request carrying only the tail of the partial output, then stitches the two
+parts together.
+
+Examples:
+    # List checkpoints left by interrupted generations
+    python checkpoints.py --list
+
+    # Delete checkpoints older than 7 days
+    python checkpoints.py --prune 7
+"""
+
+import sys
+import json
+import time
+import hashlib
+import argparse
+from pathlib import Path
+from typing import Optional, Dict, Any, List
+
+# Ensure the current directory is in the path
+current_dir = Path(__file__).parent
+if str(current_dir) not in sys.path:
+    sys.path.append(str(current_dir))
+
+from tracing import traced
+from runtime_config import get_config
+
+# Checkpoints live in .cursor/checkpoints under the project root
+CHECKPOINT_DIRNAME = "checkpoints"
+
+# Characters of partial output sent back as context for a continuation
+CONTINUATION_TAIL_CHARS = 4000
+
+# Longest repeated text trimmed from the start of a continuation
+MAX_OVERLAP_CHARS = 1000
+
+# Checkpoints untouched for this long are deleted when a new one is created
+STALE_CHECKPOINT_DAYS = 7
+
+
+def default_checkpoint_dir() -> Path:
+    """Return the project's checkpoint directory (.cursor/checkpoints)."""
+    return get_config().cursor_dir / CHECKPOINT_DIRNAME
+
+
+def request_key(*parts: Optional[str]) -> str:
+    """
+    Hash the parts of a request that determine its output.
+
+    Args:
+        *parts: Values such as backend, model, topic and objective
+
+    Returns:
+        A hex digest used to name the checkpoint
+    """
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update((part or "").encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()[:32]
+
+
+class GenerationCheckpoint:
+    """Append-only partial output and metadata for one request."""
+
+    def __init__(self, key: str, checkpoint_dir: Optional[Path] = None):
+        self.key = key
+        self.directory = Path(checkpoint_dir) if checkpoint_dir else default_checkpoint_dir()
+        self.partial_path = self.directory / f"{key}.partial.md"
+        self.meta_path = self.directory / f"{key}.json"
+        self._file = None
+
+    def exists(self) -> bool:
+        return self.partial_path.exists()
+
+    def load(self) -> str:
+        """Return the checkpointed partial output, or an empty string."""
+        try:
+            with open(self.partial_path, "r", encoding="utf-8") as f:
+                return f.read()
+        except FileNotFoundError:
+            return ""
+
+    def metadata(self) -> Dict[str, Any]:
+        try:
+            with open(self.meta_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def start(self, metadata: Dict[str, Any], resume: bool = False):
+        """
+        Open the checkpoint for writing.
+
+        Args:
+            metadata: Request details stored alongside the partial output
+            resume: Keep existing partial output instead of starting over
+        """
+        self.directory.mkdir(parents=True, exist_ok=True)
+        prune_checkpoints(STALE_CHECKPOINT_DAYS, self.directory)
+        previous = self.metadata() if resume else {}
+        meta = dict(metadata)
+        meta['started_at'] = previous.get('started_at', time.time())
+        meta['attempts'] = previous.get('attempts', 0) + 1
+        with open(self.meta_path, "w", encoding="utf-8") as f:
+            json.dump(meta, f, indent=2)
+        self._file = open(self.partial_path, "a" if resume else "w", encoding="utf-8")
+
+    def append(self, text: str):
+        """Append streamed text and flush it to disk."""
+        self._file.write(text)
+        self._file.flush()
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def clear(self):
+        """Delete the checkpoint after a successful generation."""
+        self.close()
+        for path in (self.partial_path, self.meta_path):
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+
+
+def continuation_prompt(prompt: str, partial: str) -> str:
+    """
+    Build a request that continues a partially generated document.
+
+    Args:
+        prompt: The original prompt
+        partial: Output generated before the failure
+
+    Returns:
+        The original prompt followed by the tail of the partial output
+    """
+    tail = partial[-CONTINUATION_TAIL_CHARS:]
+    return f"""{prompt}
+
+IMPORTANT: A previous response to this request was interrupted after {len(partial)} characters.
+The document written so far ends with the text between the markers below:
+
+<<<PARTIAL_END
+{tail}
+PARTIAL_END>>>
+
+Continue the document exactly where it stops, mid-sentence or mid-code-block if needed.
+Do not repeat text that was already written, do not restart the document and do not add any preamble."""
+
+
+def trim_overlap(partial: str, continuation: str) -> str:
+    """
+    Remove text at the start of a continuation that repeats the end of the partial output.
+
+    Args:
+        partial: Output generated before the failure
+        continuation: Start of the continuation
+
+    Returns:
+        The continuation without the repeated text
+    """
+    tail = partial[-MAX_OVERLAP_CHARS:]
+    for size in range(min(len(tail), len(continuation)), 0, -1):
+        if tail.endswith(continuation[:size]):
+            # Ignore tiny coincidental overlaps such as a single space or newline
+            return continuation[size:] if size >= 8 else continuation
+    return continuation
+
+
+def list_checkpoints(checkpoint_dir: Optional[Path] = None) -> List[Dict[str, Any]]:
+    """Return metadata for all checkpoints, newest first."""
+    directory = Path(checkpoint_dir) if checkpoint_dir else default_checkpoint_dir()
+    if not directory.exists():
+        return []
+    result = []
+    for partial in directory.glob("*.partial.md"):
+        key = partial.name[:-len(".partial.md")]
+        checkpoint = GenerationCheckpoint(key, directory)
+        meta = checkpoint.metadata()
+        meta['key'] = key
+        meta['bytes'] = partial.stat().st_size
+        meta['updated_at'] = partial.stat().st_mtime
+        result.append(meta)
+    return sorted(result, key=lambda m: m['updated_at'], reverse=True)
+
+
+@traced()
+def prune_checkpoints(max_age_days: float, checkpoint_dir: Optional[Path] = None) -> int:
+    """
+    Delete checkpoints that have not been updated for a while.
+
+    Args:
+        max_age_days: Age in days after which a checkpoint is deleted
+        checkpoint_dir: Checkpoint directory (defaults to .cursor/checkpoints)
+
+    Returns:
+        The number of checkpoints deleted
+    """
+    cutoff = time.time() - max_age_days * 86400
+    deleted = 0
+    for meta in list_checkpoints(checkpoint_dir):
+        if meta['updated_at'] < cutoff:
+            GenerationCheckpoint(meta['key'], checkpoint_dir).clear()
+            deleted += 1
+    return deleted
+
+
+#----------------------------------------
+# Command Line Interface
+#----------------------------------------
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generation checkpoints")
+    parser.add_argument("--list", action="store_true", help="List checkpoints (default)")
+    parser.add_argument("--prune", type=float, metavar="DAYS", help="Delete checkpoints older than DAYS")
+    parser.add_argument("--dir", help="Checkpoint directory (default: .cursor/checkpoints)")
+    args = parser.parse_args()
+
+    if args.prune is not None:
+        print(f"Deleted {prune_checkpoints(args.prune, args.dir)} checkpoint(s)")
+        sys.exit(0)
+
+    for meta in list_checkpoints(args.dir):
+        updated = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(meta['updated_at']))
+        print(f"{meta['key']}  {updated}  {meta['bytes']:>8} bytes  "
+              f"attempts={meta.get('attempts', '?')}  {meta.get('topic', '')}")
@@ -0,0 +1,275 @@
+#!/usr/bin/env python3
+"""
+Context Cache
+
+Registry of cached contexts so repeated generations over the same large input
+(re-summarizing a session, --latest after --recent, reduce passes) only send the
+changing part of the prompt.
+
+On backends with provider-side caching (the Gemini backends) content above the
+model's minimum cache size is uploaded once and later requests reference it by
+handle. Otherwise the cache is emulated locally: the content is sent as a
+stable prompt prefix, which llama.cpp and similar servers reuse from their
+prompt cache. Either way the registry tracks TTLs and hit metrics in
+.cursor/cache/context_cache.json so they survive between runs; expired entries
+are dropped whenever the registry is loaded or saved. Only hits that actually
+avoid resending content (remote contexts, prefix-caching servers) count as hits
+and reused characters; the rest are emulated_hits.
+
+Examples:
+    # Show hit metrics and live contexts
+    python context_cache.py --stats
+
+    # Drop expired entries (provider-side caches expire on their own)
+    python context_cache.py --purge
+"""
+
+import os
+import sys
+import json
+import time
+import hashlib
+import argparse
+import threading
+from pathlib import Path
+from typing import Optional, Dict, Any
+
+# Ensure the current directory is in the path
+current_dir = Path(__file__).parent
+if str(current_dir) not in sys.path:
+    sys.path.append(str(current_dir))
+
+from generation_backends import GenerationBackend, CachedContext
+from runtime_config import get_config, setting
+
+DEFAULT_TTL_SECONDS = 3600
+REGISTRY_FILENAME = "context_cache.json"
+
+_METRIC_KEYS = ("hits", "emulated_hits", "misses", "expired", "remote_created", "remote_skipped",
+                "remote_failures", "chars_reused")
+
+
+def context_cache_enabled() -> bool:
+    """Return False if context caching has been disabled with CURSOR_TOOLS_CONTEXT_CACHE=0."""
+    value = setting("CURSOR_TOOLS_CONTEXT_CACHE", "cache.context_cache", "1")
+    return str(value).strip().lower() not in ("0", "false", "no")
+
+
+def default_ttl() -> float:
+    """Return the configured context TTL in seconds."""
+    return setting("CURSOR_TOOLS_CONTEXT_CACHE_TTL", "cache.context_ttl_seconds", DEFAULT_TTL_SECONDS, float)
+
+
+class ContextCache:
+    """
+    Persistent registry of cached contexts with TTL management and hit metrics.
+
+    Entries are keyed by backend, model and a hash of the content and
+    instructions, so identical input reuses the same context until it expires.
+    """
+
+    def __init__(self, registry_path: Optional[Path] = None):
+        self.registry_path = Path(registry_path) if registry_path else None
+        self._lock = threading.Lock()
+        self._data = {'entries': {}, 'metrics': {k: 0 for k in _METRIC_KEYS}}
+        if self.registry_path and self.registry_path.exists():
+            try:
+                with open(self.registry_path, "r", encoding="utf-8") as f:
+                    loaded = json.load(f)
+                self._data['entries'].update(loaded.get('entries', {}))
+                self._data['metrics'].update(loaded.get('metrics', {}))
+            except (OSError, ValueError):
+                pass
+            self._drop_expired(time.time())
+
+    @staticmethod
+    def key(backend: GenerationBackend, content: str, system_instruction: Optional[str] = None) -> str:
+        """Return the registry key for content sent to a backend and model."""
+        digest = hashlib.sha256()
+        for part in (backend.name, backend.model or "", system_instruction or "", content):
+            digest.update(part.encode("utf-8"))
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+    def _drop_expired(self, now: float) -> Dict[str, Dict[str, Any]]:
+        """Remove and return expired entries; the caller holds the lock."""
+        expired = {k: e for k, e in self._data['entries'].items() if e['expires_at'] <= now}
+        for key in expired:
+            del self._data['entries'][key]
+        self._data['metrics']['expired'] += len(expired)
+        return expired
+
+    def _save(self):
+        if not self.registry_path:
+            return
+        # Keep the registry to live entries so a long run doesn't rewrite an ever-growing file
+        self._drop_expired(time.time())
+        self.registry_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.registry_path.with_name(self.registry_path.name + ".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self._data, f, indent=2)
+        os.replace(tmp, self.registry_path)
+
+    def get_or_create(
+        self,
+        backend: GenerationBackend,
+        content: str,
+        system_instruction: Optional[str] = None,
+        ttl: Optional[float] = None,
+        debug: bool = False,
+    ) -> CachedContext:
+        """
+        Return a cached context for the content, creating one on a miss.
+
+        Falls back to local emulation when the backend has no provider-side
+        cache, the model can't cache, the content is below the model's minimum
+        cache size or the provider rejects it.
+
+        Args:
+            backend: Backend the context will be used with
+            content: The large, stable content
+            system_instruction: Instructions stored with the content
+            ttl: Time to live in seconds (defaults to the configured TTL)
+            debug: Whether to print debug messages
+
+        Returns:
+            A CachedContext to pass to backend.stream()
+        """
+        ttl = ttl or default_ttl()
+        key = self.key(backend, content, system_instruction)
+        now = time.time()
+
+        with self._lock:
+            metrics = self._data['metrics']
+            entry = self._data['entries'].get(key)
+            if entry and entry['expires_at'] <= now:
+                metrics['expired'] += 1
+                del self._data['entries'][key]
+                entry = None
+
+            if entry:
+                # Emulated contexts only save work on servers that reuse the prompt prefix
+                if entry['remote'] or backend.reuses_prompt_prefix:
+                    metrics['hits'] += 1
+                    metrics['chars_reused'] += len(content)
+                else:
+                    metrics['emulated_hits'] += 1
+                # Emulated contexts are refreshed on use, like a server-side prompt cache
+                if not entry['remote']:
+                    entry['expires_at'] = now + ttl
+                self._save()
+                if debug:
+                    print(f"DEBUG: Context cache hit: {entry['handle']}")
+                return CachedContext(entry['handle'], content, system_instruction,
+                                     entry['expires_at'], entry['remote'])
+
+            metrics['misses'] += 1
+            min_chars = backend.remote_context_min_chars() if backend.supports_context_cache else None
+            upload = backend.supports_context_cache and min_chars is not None and len(content) >= min_chars
+            if backend.supports_context_cache and not upload:
+                # Skip the round trip the provider would reject anyway
+                metrics['remote_skipped'] += 1
+                if debug:
+                    reason = ("the model doesn't support caching" if min_chars is None
+                              else f"content is below the minimum cache size of {min_chars} chars")
+                    print(f"DEBUG: Not creating a provider context ({reason}), emulating locally")
+
+        # The upload is a network call, so other workers may use the registry meanwhile
+        handle = None
+        failed = False
+        if upload:
+            try:
+                handle = backend.create_remote_context(content, system_instruction, ttl)
+            except Exception as e:
+                failed = True
+                if debug:
+                    print(f"DEBUG: Provider context cache unavailable, emulating locally: {e}")
+
+        with self._lock:
+            metrics = self._data['metrics']
+            if handle is not None:
+                metrics['remote_created'] += 1
+            elif failed:
+                metrics['remote_failures'] += 1
+            now = time.time()
+            entry = {
+                'handle': handle or f"local:{key[:16]}",
+                'remote': handle is not None,
+                'backend': backend.name,
+                'model': backend.model,
+                'created_at': now,
+                'expires_at': now + ttl,
+                'chars': len(content),
+            }
+            self._data['entries'][key] = entry
+            self._save()
+        if debug:
+            print(f"DEBUG: Registered cached context: {entry['handle']}")
+        return CachedContext(entry['handle'], content, system_instruction,
+                             entry['expires_at'], entry['remote'])
+
+    def purge_expired(self, backend: Optional[GenerationBackend] = None) -> int:
+        """
+        Drop expired entries from the registry.
+
+        Args:
+            backend: If given, also delete this backend's provider-side caches
+
+        Returns:
+            The number of entries removed
+        """
+        with self._lock:
+            expired = self._drop_expired(time.time())
+            self._save()
+        if backend is not None:
+            for entry in expired.values():
+                if entry['remote'] and entry['backend'] == backend.name:
+                    try:
+                        backend.delete_remote_context(entry['handle'])
+                    except Exception:
+                        pass
+        return len(expired)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit metrics and the number of live entries."""
+        now = time.time()
+        with self._lock:
+            metrics = dict(self._data['metrics'])
+            entries = list(self._data['entries'].values())
+        lookups = metrics['hits'] + metrics['emulated_hits'] + metrics['misses']
+        metrics['hit_rate'] = metrics['hits'] / lookups if lookups else 0.0
+        metrics['live_entries'] = sum(1 for e in entries if e['expires_at'] > now)
+        metrics['remote_entries'] = sum(1 for e in entries if e['remote'] and e['expires_at'] > now)
+        return metrics
+
+
+_caches: Dict[str, ContextCache] = {}
+
+
+def get_context_cache(project_root: Path) -> ContextCache:
+    """Return the process-wide context cache for a project."""
+    path = Path(project_root) / ".cursor" / "cache" / REGISTRY_FILENAME
+    cache = _caches.get(str(path))
+    if cache is None:
+        cache = _caches[str(path)] = ContextCache(path)
+    return cache
+
+
+#----------------------------------------
+# Command Line Interface
+#----------------------------------------
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Context cache registry")
+    parser.add_argument("--stats", action="store_true", help="Show hit metrics (default)")
+    parser.add_argument("--purge", action="store_true", help="Drop expired entries from the registry")
+    parser.add_argument("--registry", help="Registry path (default: .cursor/cache/context_cache.json)")
+    args = parser.parse_args()
+
+    cache = ContextCache(Path(args.registry) if args.registry else get_config().cache_dir / REGISTRY_FILENAME)
+    if args.purge:
+        print(f"Purged {cache.purge_expired()} expired context(s)")
+    stats = cache.stats()
+    for name in _METRIC_KEYS + ("hit_rate", "live_entries", "remote_entries"):
+        value = stats[name]
+        print(f"{name:<16} {value:.1%}" if name == "hit_rate" else f"{name:<16} {value}")
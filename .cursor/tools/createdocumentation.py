@@ -6,14 +6,27 @@ A simple research tool that uses Gemini to produce high-quality documentation in
 Can be used as a command-line tool or imported and used programmatically from other Python scripts.
 """
 
-import os
 import sys
 import argparse
 import datetime
+from pathlib import Path
 from typing import Optional, Dict, Any
 
-from google import genai
-from google.genai import types
+# Ensure the current directory is in the path
+current_dir = Path(__file__).parent
+if str(current_dir) not in sys.path:
+    sys.path.append(str(current_dir))
+
+from tracing import span, traced
+
+with span("imports", module="createdocumentation"):
+    from generation_backends import get_backend, backend_requires_api_key, CancellationToken
+    from checkpoints import GenerationCheckpoint, request_key, continuation_prompt, trim_overlap
+    from section_index import write_index
+    from runtime_config import load_api_key
+
+# Characters of a continuation buffered before overlap with the checkpoint is trimmed
+_OVERLAP_BUFFER_CHARS = 200
 
 class Colors:
     """ANSI color codes for terminal output."""
@@ -25,14 +38,19 @@ class Colors:
     ENDC = '\033[0m'
     BOLD = '\033[1m'
 
+@traced()
 def research(
     topic: str,
     objective: str,
     output_file: Optional[str] = None,
-    model: str = "gemini-2.5-pro-exp-03-25",
+    model: Optional[str] = None,
     api_key: Optional[str] = None,
     verbose: bool = False,
-    show_progress: bool = False
+    show_progress: bool = False,
+    first_chunk_timeout: Optional[float] = None,
+    total_timeout: Optional[float] = None,
+    cancel_token: Optional[CancellationToken] = None,
+    resume: bool = False
 ) -> str:
     """
     Generate a research document using Gemini.
@@ -41,24 +59,33 @@ def research(
         topic: Topic to research
         objective: Research objective
         output_file: File to save the research document (optional)
-        model: Gemini model to use
+        model: Model to use (defaults to the configured model; non-Gemini backends use their own)
         api_key: API key for Gemini (defaults to environment variables)
         verbose: Whether to print verbose output
         show_progress: Whether to show streaming progress
+        first_chunk_timeout: Seconds to wait for the first chunk (defaults to the configured deadline)
+        total_timeout: Seconds allowed for the whole document (defaults to the configured deadline)
+        cancel_token: Optional CancellationToken to stop the generation early
+        resume: Continue from the checkpoint left by an interrupted run of the same request
         
     Returns:
         The generated research document as a string
+        
+    Raises:
+        GenerationTimeout: A deadline was missed
+        GenerationCancelled: The generation was cancelled
     """
-    # Setup API client
-    api_key = api_key or os.environ.get("GEMINI_API_KEY") or os.environ.get("GOOGLE_API_KEY")
-    if not api_key:
+    # Setup the backend routed for research (Gemini with Google Search by default)
+    api_key = api_key or load_api_key()
+    if not api_key and backend_requires_api_key("research"):
         raise ValueError("Gemini API key is required. Set it as GEMINI_API_KEY or GOOGLE_API_KEY environment variable.")
     
-    client = genai.Client(api_key=api_key)
+    backend = get_backend("research", model=model, api_key=api_key)
     
     if verbose:
         print(f"\n{Colors.HEADER}Researching: {topic}{Colors.ENDC}")
         print(f"{Colors.BLUE}Objective: {objective}{Colors.ENDC}")
+        print(f"{Colors.BLUE}Backend: {backend.describe()}{Colors.ENDC}")
     
     # Enhanced prompt with more specific instructions
     prompt = f"""Today is: {datetime.date.today()}\nResearch the {topic} and provide a thorough, comprehensive summary for {objective} in an efficient format for a developer to use to write code.
@@ -77,63 +104,88 @@ The final document should be comprehensive, technically accurate, and immediatel
 
 Please format your response in well-structured markdown with appropriate headers, code blocks, tables, and formatting for readability."""
 
-    contents = [
-        types.Content(
-            role="user",
-            parts=[
-                types.Part.from_text(text=prompt)
-            ],
-        ),
-    ]
-    
-    tools = [
-        types.Tool(google_search=types.GoogleSearch())
-    ]
-    
-    generate_content_config = types.GenerateContentConfig(
-        tools=tools,
-        response_mime_type="text/plain"
-    )
-    
     if verbose:
         print(f"{Colors.BLUE}Generating documentation...{Colors.ENDC}")
     
+    # Partial output is checkpointed as it streams so an interrupted run can resume
+    checkpoint = GenerationCheckpoint(request_key(backend.name, backend.model, topic, objective))
+    partial = checkpoint.load() if resume else ""
+    if partial:
+        prompt = continuation_prompt(prompt, partial)
+        if verbose:
+            print(f"{Colors.BLUE}Resuming from checkpoint ({len(partial)} characters){Colors.ENDC}")
+    checkpoint.start({
+        'topic': topic,
+        'objective': objective,
+        'backend': backend.name,
+        'model': backend.model,
+        'output_file': output_file,
+    }, resume=bool(partial))
+    
     # Use streaming mode to capture all content
-    document = ""
+    document = partial
     if show_progress:
         print("\n")  # Add a newline before streaming content
+        if partial:
+            print(partial, end="")
+    
+    # Continuations are buffered briefly so text repeating the checkpoint can be trimmed
+    pending = ""
+    
+    def emit(text: str):
+        nonlocal document
+        if show_progress:
+            print(text, end="")
+            sys.stdout.flush()
+        document += text
+        checkpoint.append(text)
     
     try:
-        response_stream = client.models.generate_content_stream(
-            model=model,
-            contents=contents,
-            config=generate_content_config
-        )
-        
-        for chunk in response_stream:
-            if hasattr(chunk, 'text') and chunk.text:
-                if show_progress:
-                    print(chunk.text, end="")
-                    sys.stdout.flush()
-                document += chunk.text
-    except Exception as e:
+        for text in backend.stream(prompt, search=True, first_chunk_timeout=first_chunk_timeout,
+                                   total_timeout=total_timeout, cancel_token=cancel_token):
+            if partial and pending is not None:
+                pending += text
+                if len(pending) < _OVERLAP_BUFFER_CHARS:
+                    continue
+                text, pending = trim_overlap(partial, pending), None
+            emit(text)
+        if partial and pending:
+            emit(trim_overlap(partial, pending))
+    except BaseException as e:
+        if partial and pending:
+            # Keep the buffered continuation so the next resume doesn't lose it
+            emit(trim_overlap(partial, pending))
+        checkpoint.close()
         if verbose:
-            print(f"\n{Colors.FAIL}Error during content generation: {str(e)}{Colors.ENDC}")
+            if isinstance(e, Exception):
+                print(f"\n{Colors.FAIL}Error during content generation: {str(e)}{Colors.ENDC}")
+            print(f"{Colors.WARNING}Partial output ({len(document)} characters) checkpointed; "
+                  f"rerun with --resume to continue{Colors.ENDC}")
         raise
     
+    checkpoint.close()
+    
     if show_progress:
         print("\n")  # Add a newline after streaming content
     
     # Save to file if specified
     if output_file:
-        with open(output_file, "w", encoding="utf-8") as f:
-            f.write(document)
+        with span("write_output", chars=len(document)):
+            with open(output_file, "w", encoding="utf-8") as f:
+                f.write(document)
+            # Index headings and code blocks so single sections can be read cheaply
+            write_index(Path(output_file))
         if verbose:
             print(f"{Colors.GREEN}Research document saved to: {output_file}{Colors.ENDC}")
     
+    # Only drop the checkpoint once the document is safely written
+    checkpoint.clear()
+    
     return document
 
-def create_documentation(topic: str, objective: str, output_path: Optional[str] = None, **kwargs) -> Dict[str, Any]:
+@traced()
+def create_documentation(topic: str, objective: str, output_path: Optional[str] = None,
+                         resume: bool = False, **kwargs) -> Dict[str, Any]:
     """
     Function designed to be called from other scripts to create documentation.
     
@@ -141,7 +193,9 @@ def create_documentation(topic: str, objective: str, output_path: Optional[str]
         topic: Topic to research
         objective: Research objective
         output_path: Path to save the output file (optional)
-        **kwargs: Additional keyword arguments to pass to research()
+        resume: Continue from the checkpoint left by an interrupted run of the same request
+        **kwargs: Additional keyword arguments to pass to research(), such as model,
+                  first_chunk_timeout, total_timeout and cancel_token
         
     Returns:
         A dictionary containing the results and metadata
@@ -157,6 +211,7 @@ def create_documentation(topic: str, objective: str, output_path: Optional[str]
         topic=topic,
         objective=objective,
         output_file=output_path,
+        resume=resume,
         verbose=verbose,
         show_progress=show_progress,
         **{k: v for k, v in kwargs.items() if k not in ['verbose', 'show_progress']}
@@ -182,10 +237,13 @@ def parse_arguments():
     parser.add_argument("--topic", "-t", help="Main topic to research")
     parser.add_argument("--objective", "-o", help="Research objective")
     parser.add_argument("--output", "-f", help="Output file path (default: research_result.md)")
-    parser.add_argument("--model", "-m", default="gemini-2.5-pro-exp-03-25", help="Gemini model to use")
+    parser.add_argument("--model", "-m", help="Gemini model to use (default: the configured model, else gemini-2.5-pro-exp-03-25)")
     parser.add_argument("--api-key", "-k", help="Gemini API key")
     parser.add_argument("--verbose", "-v", action="store_true", help="Enable verbose output")
     parser.add_argument("--stream", "-s", action="store_true", help="Show content as it's generated")
+    parser.add_argument("--first-chunk-timeout", type=float, help="Seconds to wait for the first chunk (0 disables)")
+    parser.add_argument("--total-timeout", type=float, help="Seconds allowed for the whole document (0 disables)")
+    parser.add_argument("--resume", action="store_true", help="Continue an interrupted generation from its checkpoint")
     
     return parser.parse_args()
 
@@ -229,7 +287,10 @@ def main():
             model=args.model,
             api_key=args.api_key,
             verbose=True,
-            show_progress=args.stream
+            show_progress=args.stream,
+            first_chunk_timeout=args.first_chunk_timeout,
+            total_timeout=args.total_timeout,
+            resume=args.resume
         )
         
         end_time = datetime.datetime.now()
@@ -239,6 +300,9 @@ def main():
         print(f"{Colors.GREEN}Document saved to:{Colors.ENDC}")
         print(f"{Colors.BOLD}{params['output_file']}{Colors.ENDC}\n")
         
+    except KeyboardInterrupt:
+        print(f"\n{Colors.WARNING}Research cancelled{Colors.ENDC}", file=sys.stderr)
+        sys.exit(130)
     except Exception as e:
         print(f"\n{Colors.FAIL}Error: {str(e)}{Colors.ENDC}", file=sys.stderr)
         sys.exit(1)
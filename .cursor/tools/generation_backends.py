@@ -0,0 +1,714 @@
+#!/usr/bin/env python3
+"""
+Generation Backends
+
+A single streaming text-generation interface shared by createdocumentation.py and
+chat_summary_tool.py, with interchangeable implementations:
+
+    genai          Google Gen AI SDK (google.genai), supports Google Search grounding
+    gemini-legacy  Legacy Google Generative AI SDK (google.generativeai)
+    openai         Any OpenAI-compatible chat completions server, e.g. a local
+                   llama.cpp server, vLLM or Ollama
+    fake           Deterministic offline backend for air-gapped CI
+
+Each task (summarize, research, reduce) is routed to a backend through the
+environment, e.g. CURSOR_TOOLS_BACKEND_SUMMARIZE=openai. CURSOR_TOOLS_BACKEND sets
+the default for every task.
+
+Every stream runs with a deadline for the first chunk and for the whole response
+(CURSOR_TOOLS_FIRST_CHUNK_TIMEOUT and CURSOR_TOOLS_TOTAL_TIMEOUT, in seconds) and
+can be cancelled cooperatively with a CancellationToken.
+
+Examples:
+    # Check which backend each task is routed to
+    python generation_backends.py --routes
+
+    # Send a prompt through the summarize route
+    python generation_backends.py --task summarize "Say hello"
+"""
+
+import sys
+import json
+import time
+import queue
+import datetime
+import argparse
+import threading
+import urllib.request
+from pathlib import Path
+from typing import Optional, Iterator, Dict, Type, Callable, List
+
+# Ensure the current directory is in the path
+current_dir = Path(__file__).parent
+if str(current_dir) not in sys.path:
+    sys.path.append(str(current_dir))
+
+from tracing import span
+from runtime_config import get_config, setting, load_api_key
+
+TASKS = ("summarize", "research", "reduce")
+
+# Backend used by each task when nothing is configured
+DEFAULT_ROUTES = {
+    "research": "genai",
+    "summarize": "gemini-legacy",
+    "reduce": "gemini-legacy",
+}
+
+DEFAULT_GEMINI_MODEL = "gemini-2.5-pro-exp-03-25"
+DEFAULT_LOCAL_BASE_URL = "http://127.0.0.1:8080/v1"
+
+# Default deadlines in seconds; 0 disables a limit
+DEFAULT_FIRST_CHUNK_TIMEOUT = 180
+DEFAULT_TOTAL_TIMEOUT = 1200
+
+# How often a waiting stream checks for cancellation
+_POLL_INTERVAL = 0.1
+
+# Minimum input for Gemini explicit context caching, in tokens, by model prefix;
+# other models need 32768. Experimental models don't support caching at all.
+GEMINI_CACHE_MIN_TOKENS = (
+    ("gemini-2.5-flash", 1024),
+    ("gemini-2.5-pro", 4096),
+)
+GEMINI_CACHE_DEFAULT_MIN_TOKENS = 32768
+CHARS_PER_TOKEN = 4
+
+
+def gemini_cache_min_chars(model: str) -> Optional[int]:
+    """Return the smallest content Gemini will cache for a model (in characters), or None if it can't."""
+    name = model[len("models/"):] if model.startswith("models/") else model
+    if "-exp" in name:
+        return None
+    for prefix, tokens in GEMINI_CACHE_MIN_TOKENS:
+        if name.startswith(prefix):
+            return tokens * CHARS_PER_TOKEN
+    return GEMINI_CACHE_DEFAULT_MIN_TOKENS * CHARS_PER_TOKEN
+
+
+class BackendError(RuntimeError):
+    """Raised when a backend cannot be configured or a request fails."""
+
+
+class GenerationCancelled(BackendError):
+    """Raised when a generation is cancelled through its CancellationToken."""
+
+
+class GenerationTimeout(BackendError):
+    """Raised when a generation misses its first-chunk or total deadline."""
+
+
+class CancellationToken:
+    """
+    Cooperative cancellation flag shared between a caller and running generations.
+
+    Call cancel() from any thread; streams using the token stop at the next
+    poll and close their underlying response.
+    """
+
+    def __init__(self):
+        self._event = threading.Event()
+        self._callbacks: List[Callable[[], None]] = []
+        self._lock = threading.Lock()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def cancel(self):
+        """Request cancellation and run any registered callbacks once."""
+        with self._lock:
+            if self._event.is_set():
+                return
+            self._event.set()
+            callbacks, self._callbacks = self._callbacks, []
+        for callback in callbacks:
+            try:
+                callback()
+            except Exception:
+                pass
+
+    def on_cancel(self, callback: Callable[[], None]):
+        """Register a callback to run when the token is cancelled."""
+        with self._lock:
+            if not self._event.is_set():
+                self._callbacks.append(callback)
+                return
+        callback()
+
+    def raise_if_cancelled(self):
+        if self._event.is_set():
+            raise GenerationCancelled("Generation cancelled")
+
+
+def _timeout_setting(env_var: str, key: str, value: Optional[float], default: float) -> Optional[float]:
+    """Resolve a timeout from the argument, the environment, the config file or the default; 0 means no limit."""
+    if value is None:
+        value = setting(env_var, key, default, float)
+    return value if value and value > 0 else None
+
+
+class CachedContext:
+    """
+    Large, stable prompt content registered once and referenced by handle.
+
+    Remote contexts live on the provider (Gemini context caching). Local contexts
+    emulate caching by sending the content as a stable prompt prefix, which
+    prefix-caching servers such as llama.cpp reuse without reprocessing.
+    """
+
+    def __init__(
+        self,
+        handle: str,
+        content: str,
+        system_instruction: Optional[str] = None,
+        expires_at: Optional[float] = None,
+        remote: bool = False,
+    ):
+        self.handle = handle
+        self.content = content
+        self.system_instruction = system_instruction
+        self.expires_at = expires_at
+        self.remote = remote
+
+    @property
+    def expired(self) -> bool:
+        return self.expires_at is not None and time.time() >= self.expires_at
+
+    def compose(self, prompt: str) -> str:
+        """Return the full inline prompt for backends without remote caching."""
+        parts = [self.system_instruction, self.content, prompt]
+        return "\n\n".join(part for part in parts if part)
+
+
+class GenerationBackend:
+    """
+    Base class for streaming generation backends.
+
+    Subclasses implement _stream(), yielding text chunks as they arrive, and may
+    override abort() to close an in-flight response from another thread.
+    Backends with provider-side context caching set supports_context_cache and
+    implement create_remote_context(), delete_remote_context() and
+    remote_context_min_chars(). Backends whose server reuses a repeated prompt
+    prefix set reuses_prompt_prefix.
+    """
+
+    name = "base"
+    requires_api_key = False
+    supports_search = False
+    supports_context_cache = False
+    reuses_prompt_prefix = False
+
+    def __init__(self, model: Optional[str] = None, api_key: Optional[str] = None):
+        self.model = model
+        self.api_key = api_key
+
+    def _stream(self, prompt: str, search: bool = False, cached_context: Optional[CachedContext] = None) -> Iterator[str]:
+        raise NotImplementedError
+
+    def abort(self):
+        """Close the in-flight response, if the backend can do so from another thread."""
+
+    def create_remote_context(self, content: str, system_instruction: Optional[str], ttl: float) -> str:
+        """
+        Register content with the provider's context cache.
+
+        Args:
+            content: The large, stable content
+            system_instruction: Instructions stored with the content
+            ttl: Time to live in seconds
+
+        Returns:
+            The provider's handle for the cached context
+        """
+        raise BackendError(f"The {self.name} backend does not support context caching")
+
+    def delete_remote_context(self, handle: str):
+        """Delete a context from the provider's cache."""
+
+    def remote_context_min_chars(self) -> Optional[int]:
+        """Return the smallest content worth registering with the provider's cache, or None if the model can't cache."""
+        return None
+
+    def stream(
+        self,
+        prompt: str,
+        search: bool = False,
+        first_chunk_timeout: Optional[float] = None,
+        total_timeout: Optional[float] = None,
+        cancel_token: Optional[CancellationToken] = None,
+        cached_context: Optional[CachedContext] = None,
+    ) -> Iterator[str]:
+        """
+        Stream generated text for a prompt, enforcing deadlines and cancellation.
+
+        The backend stream is consumed on a worker thread so a stalled response
+        can't block the caller. When the caller stops early (deadline, cancellation,
+        Ctrl-C or simply abandoning the iterator) the underlying stream is closed.
+
+        Args:
+            prompt: The full prompt text
+            search: Whether to ground the answer with web search, where supported
+            first_chunk_timeout: Seconds to wait for the first chunk (None uses the configured default)
+            total_timeout: Seconds allowed for the whole response (None uses the configured default)
+            cancel_token: Optional token to cancel the generation
+            cached_context: Context to prepend, referenced by handle when it is remote
+
+        Yields:
+            Text chunks in the order they are generated
+
+        Raises:
+            GenerationTimeout: A deadline was missed
+            GenerationCancelled: The token was cancelled
+        """
+        first_chunk_timeout = _timeout_setting(
+            "CURSOR_TOOLS_FIRST_CHUNK_TIMEOUT", "timeouts.first_chunk_seconds", first_chunk_timeout,
+            DEFAULT_FIRST_CHUNK_TIMEOUT)
+        total_timeout = _timeout_setting(
+            "CURSOR_TOOLS_TOTAL_TIMEOUT", "timeouts.total_seconds", total_timeout, DEFAULT_TOTAL_TIMEOUT)
+        if cancel_token:
+            cancel_token.raise_if_cancelled()
+
+        # Local contexts are sent inline as a stable prefix
+        if cached_context is not None and not cached_context.remote:
+            prompt = cached_context.compose(prompt)
+            cached_context = None
+
+        chunks: queue.Queue = queue.Queue()
+        stop = threading.Event()
+
+        def produce():
+            iterator = self._stream(prompt, search=search, cached_context=cached_context)
+            try:
+                for text in iterator:
+                    chunks.put(("chunk", text))
+                    if stop.is_set():
+                        break
+            except BaseException as e:
+                chunks.put(("error", e))
+            else:
+                chunks.put(("done", None))
+            finally:
+                # Closing the generator releases the response from the worker thread
+                close = getattr(iterator, "close", None)
+                if close:
+                    try:
+                        close()
+                    except Exception:
+                        pass
+
+        worker = threading.Thread(target=produce, name=f"{self.name}-stream", daemon=True)
+        started = time.monotonic()
+        received_first = False
+        finished = False
+        chunk_count = char_count = 0
+        with span("stream", backend=self.name, model=self.model, search=search,
+                  cached_context=cached_context is not None) as trace:
+            worker.start()
+            try:
+                while True:
+                    if cancel_token:
+                        cancel_token.raise_if_cancelled()
+                    now = time.monotonic()
+                    waits = [_POLL_INTERVAL]
+                    if total_timeout is not None:
+                        remaining = started + total_timeout - now
+                        if remaining <= 0:
+                            raise GenerationTimeout(f"Generation exceeded the total deadline of {total_timeout:g}s")
+                        waits.append(remaining)
+                    if not received_first and first_chunk_timeout is not None:
+                        remaining = started + first_chunk_timeout - now
+                        if remaining <= 0:
+                            raise GenerationTimeout(f"No response within the first-chunk deadline of {first_chunk_timeout:g}s")
+                        waits.append(remaining)
+                    try:
+                        kind, value = chunks.get(timeout=min(waits))
+                    except queue.Empty:
+                        continue
+                    if kind == "chunk":
+                        if not received_first:
+                            received_first = True
+                            trace.set(first_chunk_ms=round((time.monotonic() - started) * 1000, 1))
+                        chunk_count += 1
+                        char_count += len(value)
+                        yield value
+                    elif kind == "error":
+                        finished = True
+                        raise value
+                    else:
+                        finished = True
+                        return
+            finally:
+                trace.set(chunks=chunk_count, chars=char_count)
+                if not finished:
+                    stop.set()
+                    self.abort()
+
+    def generate(self, prompt: str, search: bool = False, **kwargs) -> str:
+        """Generate a complete response by joining the stream."""
+        return "".join(self.stream(prompt, search=search, **kwargs))
+
+    def describe(self) -> str:
+        """Return a short description used in verbose and debug output."""
+        return f"{self.name} ({self.model})" if self.model else self.name
+
+
+class GenaiBackend(GenerationBackend):
+    """Google Gen AI SDK backend (google.genai)."""
+
+    name = "genai"
+    requires_api_key = True
+    supports_search = True
+    supports_context_cache = True
+
+    def __init__(self, model: Optional[str] = None, api_key: Optional[str] = None):
+        super().__init__(model or DEFAULT_GEMINI_MODEL, api_key)
+        try:
+            from google import genai
+            from google.genai import types
+        except ImportError as e:
+            raise BackendError("The genai backend requires google-genai (pip install google-genai)") from e
+        if not api_key:
+            raise BackendError("Gemini API key is required. Set it as GEMINI_API_KEY or GOOGLE_API_KEY environment variable.")
+        self.genai = genai
+        self.types = types
+        self.client = genai.Client(api_key=api_key)
+        self._stream_client = None
+
+    def _user_content(self, text: str):
+        return self.types.Content(
+            role="user",
+            parts=[
+                self.types.Part.from_text(text=text)
+            ],
+        )
+
+    def create_remote_context(self, content: str, system_instruction: Optional[str], ttl: float) -> str:
+        cache = self.client.caches.create(
+            model=self.model,
+            config=self.types.CreateCachedContentConfig(
+                contents=[self._user_content(content)],
+                system_instruction=system_instruction,
+                ttl=f"{int(ttl)}s",
+            ),
+        )
+        return cache.name
+
+    def delete_remote_context(self, handle: str):
+        self.client.caches.delete(name=handle)
+
+    def remote_context_min_chars(self) -> Optional[int]:
+        return gemini_cache_min_chars(self.model)
+
+    def _stream(self, prompt: str, search: bool = False, cached_context: Optional[CachedContext] = None) -> Iterator[str]:
+        types = self.types
+        contents = [self._user_content(prompt)]
+        # Tools can't be combined with a cached context in the same request
+        tools = [types.Tool(google_search=types.GoogleSearch())] if search and not cached_context else None
+        config = types.GenerateContentConfig(
+            tools=tools,
+            response_mime_type="text/plain",
+            cached_content=cached_context.handle if cached_context else None
+        )
+        self._stream_client = self.client
+        response_stream = self.client.models.generate_content_stream(
+            model=self.model,
+            contents=contents,
+            config=config
+        )
+        for chunk in response_stream:
+            if hasattr(chunk, 'text') and chunk.text:
+                yield chunk.text
+
+    def abort(self):
+        # A stalled stream only notices the stop flag on its next chunk, so close the
+        # client's HTTP connections instead; later calls get a fresh client
+        client, self._stream_client = self._stream_client, None
+        if client is None:
+            return
+        self.client = self.genai.Client(api_key=self.api_key)
+        try:
+            if hasattr(client, "close"):
+                client.close()
+            else:
+                client._api_client._httpx_client.close()
+        except Exception:
+            pass
+
+
+class LegacyGeminiBackend(GenerationBackend):
+    """Legacy Google Generative AI SDK backend (google.generativeai)."""
+
+    name = "gemini-legacy"
+    requires_api_key = True
+    supports_context_cache = True
+
+    def __init__(self, model: Optional[str] = None, api_key: Optional[str] = None):
+        super().__init__(model or DEFAULT_GEMINI_MODEL, api_key)
+        try:
+            import google.generativeai as genai
+        except ImportError as e:
+            raise BackendError("The gemini-legacy backend requires google-generativeai (pip install google-generativeai)") from e
+        if not api_key:
+            raise BackendError("No Gemini API key found. Please set GEMINI_API_KEY in your environment or .env file.")
+        genai.configure(api_key=api_key)
+        self.genai = genai
+        self._client = None
+
+    def _request_client(self):
+        """Create a client for one request, so abort() can close its channel without affecting others."""
+        try:
+            from google.generativeai import client as genai_client
+            return genai_client._client_manager.make_client("generative")
+        except Exception:
+            # Fall back to the shared default client; abort() then waits for the next chunk
+            return None
+
+    def create_remote_context(self, content: str, system_instruction: Optional[str], ttl: float) -> str:
+        from google.generativeai import caching
+        cache = caching.CachedContent.create(
+            model=self.model if self.model.startswith("models/") else f"models/{self.model}",
+            system_instruction=system_instruction,
+            contents=[content],
+            ttl=datetime.timedelta(seconds=ttl),
+        )
+        return cache.name
+
+    def delete_remote_context(self, handle: str):
+        from google.generativeai import caching
+        caching.CachedContent.get(handle).delete()
+
+    def remote_context_min_chars(self) -> Optional[int]:
+        return gemini_cache_min_chars(self.model)
+
+    def _stream(self, prompt: str, search: bool = False, cached_context: Optional[CachedContext] = None) -> Iterator[str]:
+        if cached_context:
+            from google.generativeai import caching
+            model_obj = self.genai.GenerativeModel.from_cached_content(
+                cached_content=caching.CachedContent.get(cached_context.handle)
+            )
+        else:
+            model_obj = self.genai.GenerativeModel(model_name=self.model)
+        request_client = self._request_client()
+        if request_client is not None:
+            model_obj._client = self._client = request_client
+        response = model_obj.generate_content(prompt, stream=True)
+        for chunk in response:
+            if hasattr(chunk, 'text') and chunk.text:
+                yield chunk.text
+
+    def abort(self):
+        # Closing the channel cancels the in-flight streaming call, even before its first chunk
+        client, self._client = self._client, None
+        if client is None:
+            return
+        try:
+            client.transport.close()
+        except Exception:
+            pass
+
+
+class OpenAICompatibleBackend(GenerationBackend):
+    """
+    Backend for OpenAI-compatible chat completion servers.
+
+    Works with a local llama.cpp server (llama-server), vLLM, Ollama and similar.
+    Configured with CURSOR_TOOLS_LOCAL_BASE_URL, CURSOR_TOOLS_LOCAL_MODEL and
+    CURSOR_TOOLS_LOCAL_API_KEY, or the local section of the config file. Gemini
+    model names passed by the tools are ignored.
+    Sends llama.cpp's cache_prompt flag unless CURSOR_TOOLS_LOCAL_CACHE_PROMPT=0,
+    for servers that reject unknown request fields.
+    """
+
+    name = "openai"
+
+    def __init__(self, model: Optional[str] = None, api_key: Optional[str] = None):
+        if model and model.startswith("gemini"):
+            model = None
+        super().__init__(
+            model or setting("CURSOR_TOOLS_LOCAL_MODEL", "local.model", "local"),
+            setting("CURSOR_TOOLS_LOCAL_API_KEY", "local.api_key"),
+        )
+        self.base_url = setting("CURSOR_TOOLS_LOCAL_BASE_URL", "local.base_url", DEFAULT_LOCAL_BASE_URL).rstrip("/")
+        self.timeout = setting("CURSOR_TOOLS_LOCAL_TIMEOUT", "local.timeout_seconds", 600, float)
+        cache_prompt = setting("CURSOR_TOOLS_LOCAL_CACHE_PROMPT", "local.cache_prompt", "1")
+        self.reuses_prompt_prefix = str(cache_prompt).strip().lower() not in ("0", "false", "no")
+
+    def _stream(self, prompt: str, search: bool = False, cached_context: Optional[CachedContext] = None) -> Iterator[str]:
+        payload = {
+            "model": self.model,
+            "messages": [{"role": "user", "content": prompt}],
+            "stream": True,
+        }
+        # Ask llama.cpp to reuse the KV cache for the prompt prefix shared with earlier requests
+        if self.reuses_prompt_prefix:
+            payload["cache_prompt"] = True
+        body = json.dumps(payload).encode("utf-8")
+        headers = {"Content-Type": "application/json", "Accept": "text/event-stream"}
+        if self.api_key:
+            headers["Authorization"] = f"Bearer {self.api_key}"
+        request = urllib.request.Request(f"{self.base_url}/chat/completions", data=body, headers=headers)
+
+        try:
+            response = urllib.request.urlopen(request, timeout=self.timeout)
+        except OSError as e:
+            raise BackendError(f"Could not reach {self.base_url}: {e}") from e
+        self._response = response
+
+        # Server-sent events: one "data: {json}" line per chunk, ending with "data: [DONE]"
+        with response:
+            for raw_line in response:
+                line = raw_line.decode("utf-8").strip()
+                if not line.startswith("data:"):
+                    continue
+                data = line[len("data:"):].strip()
+                if data == "[DONE]":
+                    break
+                event = json.loads(data)
+                if "error" in event:
+                    raise BackendError(f"Server error: {event['error']}")
+                for choice in event.get("choices", []):
+                    text = (choice.get("delta") or {}).get("content")
+                    if text:
+                        yield text
+
+    def abort(self):
+        # Closing the socket stops the server from generating further tokens
+        response = getattr(self, "_response", None)
+        if response is not None:
+            try:
+                response.close()
+            except Exception:
+                pass
+
+    def describe(self) -> str:
+        return f"{self.name} ({self.model} at {self.base_url})"
+
+
+class FakeBackend(GenerationBackend):
+    """
+    Deterministic offline backend.
+
+    Returns a short markdown document derived from the prompt, streamed in small
+    chunks, so the tools can run end to end without network access.
+    """
+
+    name = "fake"
+
+    def __init__(self, model: Optional[str] = None, api_key: Optional[str] = None):
+        super().__init__("fake", None)
+
+    def _stream(self, prompt: str, search: bool = False, cached_context: Optional[CachedContext] = None) -> Iterator[str]:
+        lines = [line.strip() for line in prompt.splitlines() if line.strip()]
+        excerpt = "\n".join(f"- {line[:120]}" for line in lines[:5])
+        text = (
+            "# Offline Response\n\n"
+            "Generated by the fake backend without contacting a model.\n\n"
+            f"## Prompt Excerpt\n\n{excerpt}\n\n"
+            f"## Statistics\n\n- Prompt length: {len(prompt)} characters\n"
+        )
+        for i in range(0, len(text), 64):
+            yield text[i:i + 64]
+
+
+BACKENDS: Dict[str, Type[GenerationBackend]] = {
+    GenaiBackend.name: GenaiBackend,
+    LegacyGeminiBackend.name: LegacyGeminiBackend,
+    OpenAICompatibleBackend.name: OpenAICompatibleBackend,
+    FakeBackend.name: FakeBackend,
+}
+
+# Friendlier names accepted in configuration
+BACKEND_ALIASES = {
+    "gemini": "genai",
+    "legacy": "gemini-legacy",
+    "local": "openai",
+    "llama.cpp": "openai",
+    "llamacpp": "openai",
+    "offline": "fake",
+}
+
+
+def backend_name_for_task(task: str) -> str:
+    """
+    Return the backend name configured for a task.
+
+    Checks CURSOR_TOOLS_BACKEND_<TASK>, then CURSOR_TOOLS_BACKEND, then the default route.
+
+    Args:
+        task: One of summarize, research or reduce
+
+    Returns:
+        The canonical backend name
+    """
+    if task not in TASKS:
+        raise ValueError(f"Unknown task: {task}. Expected one of: {', '.join(TASKS)}")
+    name = (
+        setting(f"CURSOR_TOOLS_BACKEND_{task.upper()}", f"backends.{task}")
+        or setting("CURSOR_TOOLS_BACKEND", "backends.default")
+        or DEFAULT_ROUTES[task]
+    ).strip().lower()
+    name = BACKEND_ALIASES.get(name, name)
+    if name not in BACKENDS:
+        raise BackendError(f"Unknown backend '{name}' for task {task}. Available: {', '.join(BACKENDS)}")
+    return name
+
+
+def backend_requires_api_key(task: str) -> bool:
+    """Return True if the backend routed for a task needs a Gemini API key."""
+    return BACKENDS[backend_name_for_task(task)].requires_api_key
+
+
+def get_backend(task: str, model: Optional[str] = None, api_key: Optional[str] = None) -> GenerationBackend:
+    """
+    Create the backend configured for a task.
+
+    Args:
+        task: One of summarize, research or reduce
+        model: Model to use; None falls back to CURSOR_TOOLS_MODEL_<TASK>,
+            CURSOR_TOOLS_MODEL or the models section of the config file
+        api_key: Gemini API key, required by the Gemini backends
+
+    Returns:
+        A ready-to-use backend instance
+    """
+    name = backend_name_for_task(task)
+    model = model or get_config().model(task)
+    # Includes importing the provider SDK, which is deferred until a backend is used
+    with span("client_setup", task=task, backend=name):
+        return BACKENDS[name](model=model, api_key=api_key)
+
+
+#----------------------------------------
+# Command Line Interface
+#----------------------------------------
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generation backend router")
+    parser.add_argument("prompt", nargs="?", help="Prompt to send")
+    parser.add_argument("--task", choices=TASKS, default="summarize", help="Task route to use")
+    parser.add_argument("--model", "-m", help="Model override")
+    parser.add_argument("--routes", action="store_true", help="Show the backend for each task")
+    parser.add_argument("--first-chunk-timeout", type=float, help="Seconds to wait for the first chunk")
+    parser.add_argument("--total-timeout", type=float, help="Seconds allowed for the whole response")
+    args = parser.parse_args()
+
+    if args.routes or not args.prompt:
+        for task in TASKS:
+            print(f"{task:<10} {backend_name_for_task(task)}")
+        sys.exit(0)
+
+    key = load_api_key()
+    try:
+        backend = get_backend(args.task, model=args.model, api_key=key)
+        for text in backend.stream(args.prompt, first_chunk_timeout=args.first_chunk_timeout,
+                                   total_timeout=args.total_timeout):
+            print(text, end="")
+            sys.stdout.flush()
+        print()
+    except KeyboardInterrupt:
+        print("\nCancelled", file=sys.stderr)
+        sys.exit(130)
+    except BackendError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
@@ -0,0 +1,407 @@
+#!/usr/bin/env python3
+"""
+Research Prefetch
+
+Researches topics ahead of time so later quick_research() and agent_research()
+calls for them are served from the store instead of blocking on generation.
+
+Topics come from the planning notes in .cursor/notes (project_checklist.md and
+pm-ui-ux-plan.md by default), from a topic list file, or from the command line.
+In notes, bullets under a heading such as "Research", "Technologies" or
+"Tech Stack", and checklist items starting with "Research", are taken as
+written; technologies mentioned anywhere in the prose (PostgreSQL, GraphQL,
+React, ...) are picked up by name. Completed checklist items, code blocks and
+inline code are ignored.
+
+Prefetching runs at low CPU priority, a few topics at a time, and skips topics
+that already have a recent result in the store. The store must be enabled
+(CURSOR_TOOLS_STORE=1 or store.enabled in .cursor/tools.json), since that is
+where quick_research() looks for cached results.
+
+Examples:
+    # Show the topics found in the notes without researching them
+    python prefetch.py --list
+
+    # Prefetch them in a detached background process
+    python prefetch.py --background
+
+    # Prefetch specific topics, or the topics in a file (one per line)
+    python prefetch.py "FastAPI" "SQLAlchemy 2.0"
+    python prefetch.py --file topics.txt
+"""
+
+import os
+import re
+import sys
+import argparse
+import subprocess
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Optional, Dict, Any, Callable, List, Iterable
+
+# Ensure the current directory is in the path
+current_dir = Path(__file__).parent
+if str(current_dir) not in sys.path:
+    sys.path.append(str(current_dir))
+
+from tracing import span, traced
+from research_helper import quick_research, DEFAULT_CACHE_MAX_AGE_HOURS
+from generation_backends import CancellationToken, GenerationCancelled
+from summary_store import open_store
+from runtime_config import find_project_root, get_config, setting
+
+DEFAULT_NOTES_FILES = ("project_checklist.md", "pm-ui-ux-plan.md")
+DEFAULT_CONCURRENCY = 2
+# Added to the process niceness so prefetching yields to interactive work
+DEFAULT_NICENESS = 10
+LOG_FILENAME = "prefetch.log"
+
+# Headings whose bullets are research topics in their own right
+TOPIC_HEADING_PATTERN = re.compile(r"\b(research|technolog(y|ies)|tech stack|libraries|dependencies)\b", re.IGNORECASE)
+
+# Checklist items such as "- [ ] Research Stripe webhooks"
+RESEARCH_ITEM_PATTERN = re.compile(r"^research(?: on| into)?\s*:?\s+(.+)$", re.IGNORECASE)
+
+# Technologies recognized by name in prose, and the topic each is researched under
+KNOWN_TECHNOLOGIES = (
+    (r"PostgreSQL|Postgres", "PostgreSQL"),
+    (r"MySQL", "MySQL"),
+    (r"SQLite", "SQLite"),
+    (r"Redis", "Redis"),
+    (r"MongoDB", "MongoDB"),
+    (r"GraphQL [Cc]odegen|codegen", "GraphQL Code Generator"),
+    (r"GraphQL", "GraphQL"),
+    (r"Apollo(?: Client| Server)?", "Apollo GraphQL"),
+    (r"NestJS|Nest(?= services| modules?| resolvers?\b)", "NestJS"),
+    (r"TypeORM", "TypeORM"),
+    (r"Prisma", "Prisma"),
+    (r"Next\.js", "Next.js"),
+    (r"React(?! Native)", "React"),
+    (r"React Native", "React Native"),
+    (r"Recoil", "Recoil"),
+    (r"Redux", "Redux"),
+    (r"Emotion(?= styled)", "Emotion styled components"),
+    (r"Tailwind(?: CSS)?", "Tailwind CSS"),
+    (r"TypeScript", "TypeScript"),
+    (r"Vite", "Vite"),
+    (r"Jest", "Jest"),
+    (r"Vitest", "Vitest"),
+    (r"Playwright", "Playwright"),
+    (r"Storybook", "Storybook"),
+    (r"Docker", "Docker"),
+    (r"Kubernetes", "Kubernetes"),
+    (r"FastAPI", "FastAPI"),
+    (r"Django", "Django"),
+    (r"Flask", "Flask"),
+    (r"SQLAlchemy", "SQLAlchemy"),
+    (r"Stripe", "Stripe API"),
+)
+
+_TECHNOLOGY_PATTERNS = [(re.compile(rf"(?<![\w.-])(?:{pattern})(?![\w-])"), topic)
+                        for pattern, topic in KNOWN_TECHNOLOGIES]
+
+
+def _bullet_text(line: str) -> Optional[str]:
+    """Return the text of a list item (bullet, numbered or checklist), or None."""
+    match = re.match(r"^\s*(?:[-*+]|\d+[.)])\s+(?:\[[ xX]\]\s+)?(.+)$", line)
+    if not match:
+        return None
+    # Drop emphasis, link targets and trailing explanations
+    text = re.sub(r"\*\*|__|\[([^\]]*)\]\([^)]*\)", r"\1", match.group(1))
+    text = re.split(r"\s+[-–—]\s+|:\s", text, maxsplit=1)[0]
+    return text.strip(" .*_")
+
+
+def extract_topics(text: str) -> List[str]:
+    """
+    Extract candidate research topics from a markdown notes file.
+
+    Args:
+        text: Markdown content
+
+    Returns:
+        Topics in order of first appearance, without duplicates
+    """
+    topics: List[str] = []
+    seen = set()
+
+    def add(topic: str):
+        topic = topic.strip()
+        if topic and topic.lower() not in seen:
+            seen.add(topic.lower())
+            topics.append(topic)
+
+    in_fence = False
+    topic_section_level = None
+    for line in text.splitlines():
+        if re.match(r"^\s*(```|~~~)", line):
+            in_fence = not in_fence
+            continue
+        if in_fence:
+            continue
+
+        heading = re.match(r"^(#{1,6})\s+(.*)$", line)
+        if heading:
+            level = len(heading.group(1))
+            if topic_section_level is not None and level <= topic_section_level:
+                topic_section_level = None
+            if topic_section_level is None and TOPIC_HEADING_PATTERN.search(heading.group(2)):
+                topic_section_level = level
+            continue
+
+        # Completed items ("- [x] ...", "- ✅ ...") are past work, not upcoming research
+        if re.match(r"^\s*(?:[-*+]|\d+[.)])\s+(?:\[[xX]\]|✅)", line):
+            continue
+
+        prose = re.sub(r"`[^`]*`", "", line)
+        item = _bullet_text(prose)
+        if item:
+            research_item = RESEARCH_ITEM_PATTERN.match(item)
+            if research_item:
+                add(research_item.group(1).strip(" ."))
+                continue
+            if topic_section_level is not None:
+                add(item)
+                continue
+
+        for pattern, topic in _TECHNOLOGY_PATTERNS:
+            if pattern.search(prose):
+                add(topic)
+    return topics
+
+
+def unique_topics(topics: Iterable[str]) -> List[str]:
+    """Drop case-insensitive duplicates, keeping the first spelling and order."""
+    unique: Dict[str, str] = {}
+    for topic in topics:
+        unique.setdefault(topic.lower(), topic)
+    return list(unique.values())
+
+
+def read_topic_list(path: Path) -> List[str]:
+    """Read a topic list file: one topic per line, blank lines and # comments ignored."""
+    topics = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if line and not line.startswith("#"):
+                topics.append(line.lstrip("-*+ ").strip())
+    return topics
+
+
+def notes_files() -> List[Path]:
+    """Return the notes files topics are extracted from (prefetch.notes in the config file overrides)."""
+    config = get_config()
+    names = config.get("prefetch.notes") or DEFAULT_NOTES_FILES
+    return [config.notes_dir / name for name in names]
+
+
+def collect_topics(paths: Optional[Iterable[Path]] = None, debug: bool = False) -> List[str]:
+    """
+    Collect topics from notes files plus prefetch.topics in the config file.
+
+    Args:
+        paths: Notes files to read (defaults to notes_files())
+        debug: Whether to print debug messages
+
+    Returns:
+        Topics without duplicates
+    """
+    topics = list(get_config().get("prefetch.topics") or [])
+    for path in (notes_files() if paths is None else paths):
+        if not Path(path).is_file():
+            if debug:
+                print(f"DEBUG: Notes file not found: {path}")
+            continue
+        with open(path, "r", encoding="utf-8") as f:
+            found = extract_topics(f.read())
+        if debug:
+            print(f"DEBUG: {len(found)} topic(s) in {Path(path).name}: {', '.join(found)}")
+        topics.extend(found)
+    return unique_topics(topics)
+
+
+def default_concurrency() -> int:
+    """Return the configured concurrency (CURSOR_TOOLS_PREFETCH_CONCURRENCY or concurrency.prefetch)."""
+    return setting("CURSOR_TOOLS_PREFETCH_CONCURRENCY", "concurrency.prefetch", DEFAULT_CONCURRENCY, int)
+
+
+def lower_priority(debug: bool = False):
+    """
+    Lower this process's CPU priority (CURSOR_TOOLS_PREFETCH_NICENESS or prefetch.niceness).
+
+    Does nothing on platforms without os.nice().
+    """
+    niceness = setting("CURSOR_TOOLS_PREFETCH_NICENESS", "prefetch.niceness", DEFAULT_NICENESS, int)
+    if niceness <= 0 or not hasattr(os, "nice"):
+        return
+    try:
+        os.nice(niceness)
+    except OSError as e:
+        if debug:
+            print(f"DEBUG: Could not lower priority: {e}")
+
+
+@traced()
+def prefetch_topics(
+    topics: List[str],
+    concurrency: Optional[int] = None,
+    force: bool = False,
+    debug: bool = False,
+    cancel_token: Optional[CancellationToken] = None,
+    report: Callable[[str], None] = print,
+) -> Dict[str, Any]:
+    """
+    Research topics into the store so later quick_research() calls are cache hits.
+
+    Args:
+        topics: Queries exactly as quick_research() will later be called with
+        concurrency: Maximum number of topics researched at once (defaults to the configured value)
+        force: Research topics even if the store has a recent result
+        debug: Whether to print debug messages
+        cancel_token: Optional CancellationToken to stop the run early
+        report: Callback receiving progress lines
+
+    Returns:
+        Counts of fetched, cached and failed topics
+
+    Raises:
+        RuntimeError: The store is disabled, so prefetched results could never be served
+    """
+    cancel_token = cancel_token or CancellationToken()
+    concurrency = max(1, concurrency or default_concurrency())
+    store = open_store(find_project_root())
+    if store is None:
+        raise RuntimeError("Prefetched research is served from the store; enable it with CURSOR_TOOLS_STORE=1 "
+                           "or \"store\": {\"enabled\": true} in .cursor/tools.json")
+
+    max_age_hours = setting("CURSOR_TOOLS_RESEARCH_MAX_AGE_HOURS", "cache.research_max_age_hours",
+                            DEFAULT_CACHE_MAX_AGE_HOURS, float)
+    counts = {'fetched': 0, 'cached': 0, 'failed': 0}
+    with store, span("prefetch_lookup", topics=len(topics)):
+        pending = []
+        for topic in topics:
+            if not force and store.find_by_query(topic, max_age_seconds=max_age_hours * 3600):
+                counts['cached'] += 1
+                if debug:
+                    print(f"DEBUG: Already cached: {topic}")
+            else:
+                pending.append(topic)
+    report(f"Prefetch: {len(pending)} topic(s) to research, {counts['cached']} already cached, "
+           f"concurrency {concurrency}")
+
+    def fetch(topic: str):
+        if cancel_token.cancelled:
+            raise GenerationCancelled("Prefetch cancelled")
+        # use_cache=False: the lookup above already decided this topic needs generating
+        return quick_research(topic, save_to_file=True, agent_mode=True, use_cache=False,
+                              cancel_token=cancel_token)
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        futures = {executor.submit(fetch, topic): topic for topic in pending}
+        try:
+            for future in as_completed(futures):
+                topic = futures[future]
+                try:
+                    future.result()
+                except GenerationCancelled:
+                    continue
+                except Exception as e:
+                    counts['failed'] += 1
+                    report(f"  failed: {topic}: {e}")
+                else:
+                    counts['fetched'] += 1
+                    report(f"[{counts['fetched'] + counts['failed']}/{len(pending)}] {topic}")
+        except KeyboardInterrupt:
+            report("Interrupted; cancelling remaining topics.")
+            cancel_token.cancel()
+            for future in futures:
+                future.cancel()
+
+    report(f"Prefetch {'stopped' if cancel_token.cancelled else 'complete'}: {counts['fetched']} researched, "
+           f"{counts['cached']} already cached, {counts['failed']} failed")
+    return counts
+
+
+def start_background(argv: List[str]) -> subprocess.Popen:
+    """
+    Run prefetch.py with the given arguments in a detached process.
+
+    The process runs from the project root, so pass topics rather than relative paths.
+
+    Output goes to .cursor/cache/prefetch.log.
+
+    Returns:
+        The started process
+    """
+    log_path = get_config().cache_dir / LOG_FILENAME
+    log_path.parent.mkdir(parents=True, exist_ok=True)
+    kwargs: Dict[str, Any] = {}
+    if sys.platform == "win32":
+        kwargs['creationflags'] = subprocess.DETACHED_PROCESS | subprocess.CREATE_NEW_PROCESS_GROUP
+    else:
+        kwargs['start_new_session'] = True
+    with open(log_path, "ab") as log:
+        return subprocess.Popen([sys.executable, str(Path(__file__).resolve())] + argv,
+                                stdin=subprocess.DEVNULL, stdout=log, stderr=subprocess.STDOUT,
+                                cwd=str(find_project_root()), **kwargs)
+
+
+#----------------------------------------
+# Command Line Interface
+#----------------------------------------
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Research topics ahead of time into the research cache")
+    parser.add_argument("topics", nargs="*", help="Topics to prefetch (default: topics found in the notes files)")
+    parser.add_argument("--file", "-f", action="append", default=[],
+                        help="Topic list file, one topic per line (repeatable)")
+    parser.add_argument("--notes", "-n", action="append", default=[],
+                        help="Notes file to extract topics from (repeatable; default: "
+                             f"{', '.join(DEFAULT_NOTES_FILES)} in .cursor/notes)")
+    parser.add_argument("--list", "-l", action="store_true", help="Print the topics and exit")
+    parser.add_argument("--background", "-b", action="store_true", help="Run in a detached background process")
+    parser.add_argument("--concurrency", "-c", type=int,
+                        help=f"Concurrent topics (default: concurrency.prefetch in the config file, "
+                             f"or {DEFAULT_CONCURRENCY})")
+    parser.add_argument("--force", action="store_true", help="Research topics even if already cached")
+    parser.add_argument("--debug", "-d", action="store_true", help="Enable debug messages")
+    args = parser.parse_args()
+
+    try:
+        topics = list(args.topics)
+        for path in args.file:
+            topics.extend(read_topic_list(Path(path)))
+        if args.notes or not (args.topics or args.file):
+            topics.extend(collect_topics([Path(p) for p in args.notes] or None, debug=args.debug))
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+    topics = unique_topics(topics)
+
+    if args.list:
+        for topic in topics:
+            print(topic)
+        sys.exit(0)
+    if not topics:
+        print("No topics found.")
+        sys.exit(0)
+
+    if args.background:
+        # Pass the topics themselves; relative --file and --notes paths wouldn't resolve in the child
+        argv = []
+        if args.concurrency is not None:
+            argv += ["--concurrency", str(args.concurrency)]
+        argv += ["--force"] * args.force + ["--debug"] * args.debug
+        process = start_background(argv + ["--"] + topics)
+        print(f"Prefetching {len(topics)} topic(s) in the background (pid {process.pid}); "
+              f"log: {get_config().cache_dir / LOG_FILENAME}")
+        sys.exit(0)
+
+    lower_priority(debug=args.debug)
+    try:
+        result = prefetch_topics(topics, concurrency=args.concurrency, force=args.force, debug=args.debug)
+    except RuntimeError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+    sys.exit(1 if result['failed'] else 0)
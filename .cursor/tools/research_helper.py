@@ -7,21 +7,50 @@ This is a wrapper around createdocumentation.py for even easier use.
 """
 
 import sys
-import os
 from pathlib import Path
 import tempfile
 import datetime
 import re
+from typing import Optional
 
 # Ensure the current directory is in the path
 current_dir = Path(__file__).parent
 if str(current_dir) not in sys.path:
     sys.path.append(str(current_dir))
 
-# Import the documentation tool
-from createdocumentation import create_documentation
+from tracing import span, traced
 
-def quick_research(query: str, save_to_file: bool = True, output_path: str = None, agent_mode: bool = True) -> str:
+with span("imports", module="research_helper"):
+    # Import the documentation tool
+    from createdocumentation import create_documentation
+    from generation_backends import CancellationToken
+    from summary_store import open_store, KIND_RESEARCH
+    from artifact_files import resolve_artifact, maintain_directory
+    from section_index import write_index
+    from runtime_config import find_project_root, get_config, setting
+
+# How long a stored research result may be reused (hours), when the store is enabled
+DEFAULT_CACHE_MAX_AGE_HOURS = 168
+
+def _write_temporary(content: str, safe_topic: str) -> str:
+    """Write content to a new temporary file with a meaningful name and return its path."""
+    temp_file = tempfile.NamedTemporaryFile(
+        mode="w",
+        encoding="utf-8",
+        prefix=f"research_{safe_topic[:20]}_",
+        suffix=".md",
+        delete=False
+    )
+    with temp_file:
+        temp_file.write(content)
+    write_index(Path(temp_file.name))
+    return temp_file.name
+
+@traced()
+def quick_research(query: str, save_to_file: bool = True, output_path: str = None, agent_mode: bool = True,
+                   use_cache: bool = True, first_chunk_timeout: Optional[float] = None,
+                   total_timeout: Optional[float] = None, cancel_token: Optional[CancellationToken] = None,
+                   resume: bool = False) -> str:
     """
     Quickly research a topic and return the results as a string.
     
@@ -31,6 +60,11 @@ def quick_research(query: str, save_to_file: bool = True, output_path: str = Non
         output_path: Optional path to save the research. If None but save_to_file is True,
                      creates a file in the appropriate location.
         agent_mode: If True, automatically saves to .cursor/docs when no output_path is specified
+        use_cache: If True and the store is enabled, reuse a recent result for the same query
+        first_chunk_timeout: Seconds to wait for the first chunk (defaults to the configured deadline)
+        total_timeout: Seconds allowed for the whole document (defaults to the configured deadline)
+        cancel_token: Optional CancellationToken to stop the research early
+        resume: Continue from the checkpoint left by an interrupted run of the same query
                      
     Returns:
         The research content as a string
@@ -55,28 +89,43 @@ def quick_research(query: str, save_to_file: bool = True, output_path: str = Non
     
     # Determine where to save the file
     final_output_path = None
+    docs_dir = None
     if save_to_file:
         if output_path:
             final_output_path = output_path
         elif agent_mode:
             # When in agent mode, save to .cursor/docs by default
-            # First, find the project root (where .cursor exists or could be created)
-            project_root = find_project_root()
-            docs_dir = project_root / ".cursor" / "docs"
+            docs_dir = get_config().docs_dir
             
             # Ensure the docs directory exists
             docs_dir.mkdir(parents=True, exist_ok=True)
             
             final_output_path = str(docs_dir / filename)
-        else:
-            # Create a temporary file with a meaningful name
-            temp_file = tempfile.NamedTemporaryFile(
-                prefix=f"research_{safe_topic[:20]}_",
-                suffix=".md",
-                delete=False
-            )
-            final_output_path = temp_file.name
-            temp_file.close()
+        # Otherwise a temporary file is created once there is content to write
+    
+    # Serve the query from the store when a recent result exists
+    record = None
+    store = open_store(find_project_root()) if use_cache else None
+    if store:
+        max_age_hours = setting("CURSOR_TOOLS_RESEARCH_MAX_AGE_HOURS", "cache.research_max_age_hours",
+                                DEFAULT_CACHE_MAX_AGE_HOURS, float)
+        with store, span("store_lookup") as trace:
+            record = store.find_by_query(query, max_age_seconds=max_age_hours * 3600)
+            trace.set(hit=record is not None)
+    if record:
+        content = record['content']
+        if not save_to_file:
+            return content
+        cached_path = resolve_artifact(record['export_path']) if record['export_path'] else None
+        if output_path or cached_path is None:
+            if final_output_path is None:
+                cached_path = _write_temporary(content, safe_topic)
+            else:
+                with open(final_output_path, "w", encoding="utf-8") as f:
+                    f.write(content)
+                write_index(Path(final_output_path))
+                cached_path = final_output_path
+        return f"Research saved to: {cached_path}\n\n{content}"
     
     # Run the research
     result = create_documentation(
@@ -84,48 +133,50 @@ def quick_research(query: str, save_to_file: bool = True, output_path: str = Non
         objective=objective,
         output_path=final_output_path,
         verbose=False,  # Keep it quiet
-        show_progress=False  # Don't show streaming output
+        show_progress=False,  # Don't show streaming output
+        first_chunk_timeout=first_chunk_timeout,
+        total_timeout=total_timeout,
+        cancel_token=cancel_token,
+        resume=resume
     )
     
+    if save_to_file and final_output_path is None:
+        final_output_path = _write_temporary(result['content'], safe_topic)
+    
+    # Compress and prune older documents in .cursor/docs
+    if docs_dir is not None:
+        with span("retention"):
+            maintain_directory(docs_dir)
+    
+    # Index the result for later lookups; the store is only opened now, not across the research run
+    store = open_store(find_project_root())
+    if store:
+        with store, span("store_add"):
+            store.add(KIND_RESEARCH, result['content'], topic=topic, query=query,
+                      export_path=final_output_path)
+            store.apply_retention()
+    
     # Return the content and optionally the file path
     if save_to_file:
         return f"Research saved to: {final_output_path}\n\n{result['content']}"
     else:
         return result['content']
 
-def find_project_root() -> Path:
-    """
-    Find the project root directory (where .cursor is or should be).
-    Starts from the current directory and moves up until it finds .cursor
-    or returns the home directory as a fallback.
-    """
-    # Start with the current working directory
-    current_dir = Path.cwd()
-    
-    # Check if we're already in the .cursor/tools directory
-    if current_dir.name == "tools" and current_dir.parent.name == ".cursor":
-        return current_dir.parent.parent
-    
-    # Look for .cursor directory by walking up
-    for path in [current_dir] + list(current_dir.parents):
-        if (path / ".cursor").exists():
-            return path
-    
-    # Fallback: Use home directory
-    return Path.home()
-
-def agent_research(query: str) -> str:
+@traced()
+def agent_research(query: str, cancel_token: Optional[CancellationToken] = None) -> str:
     """
     Special function specifically for agent use.
     Always saves the result to .cursor/docs and returns the content plus the save location.
     
     Args:
         query: The topic or question to research
+        cancel_token: Optional CancellationToken to stop the research early
         
     Returns:
         The research content and save location
     """
-    return quick_research(query, save_to_file=True, output_path=None, agent_mode=True)
+    return quick_research(query, save_to_file=True, output_path=None, agent_mode=True,
+                          cancel_token=cancel_token)
 
 if __name__ == "__main__":
     # Simple command line interface
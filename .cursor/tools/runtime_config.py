@@ -0,0 +1,339 @@
+#!/usr/bin/env python3
+"""
+Runtime Config
+
+One cached place for what every tool needs to know about its surroundings:
+the project root, the .env file, the Gemini API key, the default models and
+the .cursor directory layout. Everything is resolved once per process; later
+calls cost a couple of stat() calls to notice that .env or the config file
+changed, in which case they are read again.
+
+An optional JSON config file (.cursor/tools.json, or the path in
+CURSOR_TOOLS_CONFIG) sets models, backends, concurrency and cache sizes for the
+whole project. Environment variables, including those in .env, take precedence
+over the file:
+
+    {
+      "models": {"default": "gemini-2.5-pro-exp-03-25", "summarize": "gemini-2.0-flash"},
+      "backends": {"summarize": "openai"},
+      "timeouts": {"first_chunk_seconds": 120, "total_seconds": 900},
+      "concurrency": {"backfill": 4, "prefetch": 2},
+      "cache": {"context_ttl_seconds": 7200, "context_min_chars": 4000, "research_max_age_hours": 336},
+      "store": {"enabled": true, "max_age_days": 90, "max_count": 500},
+      "retention": {"compress_after_days": 7, "max_count": 200, "max_bytes": 50000000},
+      "prefetch": {"notes": ["project_checklist.md"], "topics": ["FastAPI"]}
+    }
+
+Examples:
+    # Show the resolved configuration
+    python runtime_config.py
+
+    # Show one setting
+    python runtime_config.py --get cache.context_ttl_seconds
+"""
+
+import os
+import sys
+import json
+import argparse
+import threading
+from pathlib import Path
+from typing import Optional, Dict, Any, Tuple, Callable
+
+# Ensure the current directory is in the path
+current_dir = Path(__file__).parent
+if str(current_dir) not in sys.path:
+    sys.path.append(str(current_dir))
+
+from tracing import span
+
+# python-dotenv is optional; a small parser handles the common KEY=value format without it
+try:
+    from dotenv import dotenv_values
+except ImportError:
+    dotenv_values = None
+
+CONFIG_ENV_VAR = "CURSOR_TOOLS_CONFIG"
+CONFIG_FILENAME = "tools.json"
+API_KEY_VARS = ("GEMINI_API_KEY", "GOOGLE_API_KEY")
+
+_lock = threading.RLock()
+_roots: Dict[Path, Path] = {}
+_configs: Dict[Path, Tuple[Any, "RuntimeConfig"]] = {}
+# Values this process copied from .env into os.environ, so edits to .env can replace them
+_applied_env: Dict[str, str] = {}
+
+
+def _walk_for_root(start: Path) -> Path:
+    """Find the directory containing .cursor, starting at start and moving up."""
+    # Check if we're already in the .cursor/tools directory
+    if start.name == "tools" and start.parent.name == ".cursor":
+        return start.parent.parent
+
+    # Look for .cursor directory by walking up
+    for path in [start] + list(start.parents):
+        if (path / ".cursor").exists():
+            return path
+
+    # Fallback: Use home directory
+    return Path.home()
+
+
+def find_project_root() -> Path:
+    """
+    Find the project root directory (where .cursor is or should be).
+    Starts from the current directory and moves up until it finds .cursor
+    or returns the home directory as a fallback.
+
+    The result is cached per working directory and checked with a single
+    stat() on later calls.
+    """
+    cwd = Path.cwd()
+    with _lock:
+        root = _roots.get(cwd)
+        if root is not None and (root / ".cursor").is_dir():
+            return root
+        with span("find_project_root"):
+            root = _roots[cwd] = _walk_for_root(cwd)
+        return root
+
+
+def parse_env_file(path: Path) -> Dict[str, str]:
+    """
+    Parse a .env file into a dictionary without touching os.environ.
+
+    Args:
+        path: The .env file
+
+    Returns:
+        The variables it defines (empty if the file doesn't exist)
+    """
+    if not path.is_file():
+        return {}
+    if dotenv_values is not None:
+        return {k: v for k, v in dotenv_values(path).items() if v is not None}
+    values = {}
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith("#") or "=" not in line:
+                continue
+            key, value = line.split("=", 1)
+            key = key.strip()
+            if key.startswith("export "):
+                key = key[len("export "):].strip()
+            value = value.strip()
+            if len(value) >= 2 and value[0] == value[-1] and value[0] in "\"'":
+                value = value[1:-1]
+            elif " #" in value:
+                value = value.split(" #", 1)[0].rstrip()
+            values[key] = value
+    return values
+
+
+def _apply_env(values: Dict[str, str]):
+    """
+    Copy .env values into os.environ without overriding the real environment.
+
+    Values copied earlier are replaced or removed when .env changes.
+    """
+    for key in list(_applied_env):
+        if key not in values and os.environ.get(key) == _applied_env[key]:
+            del os.environ[key]
+            del _applied_env[key]
+    for key, value in values.items():
+        if key not in os.environ or os.environ[key] == _applied_env.get(key):
+            os.environ[key] = value
+            _applied_env[key] = value
+
+
+def config_file_path(root: Path) -> Path:
+    """Return the config file for a project (CURSOR_TOOLS_CONFIG or .cursor/tools.json)."""
+    configured = os.environ.get(CONFIG_ENV_VAR, "").strip()
+    if configured:
+        path = Path(configured).expanduser()
+        return path if path.is_absolute() else root / path
+    return root / ".cursor" / CONFIG_FILENAME
+
+
+def load_config_file(path: Path) -> Dict[str, Any]:
+    """
+    Read a JSON config file.
+
+    Raises:
+        ValueError: The file exists but isn't a JSON object
+    """
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except FileNotFoundError:
+        return {}
+    except ValueError as e:
+        raise ValueError(f"Invalid config file {path}: {e}") from e
+    if not isinstance(data, dict):
+        raise ValueError(f"Invalid config file {path}: expected a JSON object")
+    return data
+
+
+def _stat_key(path: Path):
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+def _fingerprint(root: Path):
+    """Return what has to stay the same for a cached config to remain valid."""
+    config_path = config_file_path(root)
+    return (_stat_key(root / ".env"), str(config_path), _stat_key(config_path))
+
+
+class RuntimeConfig:
+    """Settings and paths resolved for one project root."""
+
+    def __init__(self, root: Path, env: Dict[str, str], settings: Dict[str, Any], config_path: Path):
+        self.root = root
+        self.env = env
+        self.settings = settings
+        self.config_path = config_path
+        self.cursor_dir = root / ".cursor"
+        self.docs_dir = self.cursor_dir / "docs"
+        self.summary_dir = self.cursor_dir / "chat_summary"
+        self.notes_dir = self.cursor_dir / "notes"
+        self.cache_dir = self.cursor_dir / "cache"
+        self.history_dir = root / ".specstory" / "history"
+
+    @property
+    def api_key(self) -> Optional[str]:
+        """Return the Gemini API key from the environment or .env."""
+        for name in API_KEY_VARS:
+            value = os.environ.get(name) or self.env.get(name)
+            if value:
+                return value
+        return None
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """
+        Return a value from the config file.
+
+        Args:
+            key: Dotted path such as cache.context_ttl_seconds
+            default: Returned when the key isn't set
+        """
+        value: Any = self.settings
+        for part in key.split("."):
+            if not isinstance(value, dict) or part not in value:
+                return default
+            value = value[part]
+        return value
+
+    def model(self, task: Optional[str] = None, default: Optional[str] = None) -> Optional[str]:
+        """Return the model configured for a task, then the default model, then the given default.
+
+        Callers with a model chosen explicitly (e.g. a --model flag) use that instead.
+        """
+        if task:
+            value = setting(f"CURSOR_TOOLS_MODEL_{task.upper()}", f"models.{task}", config=self)
+            if value:
+                return value
+        return setting("CURSOR_TOOLS_MODEL", "models.default", config=self) or default
+
+
+def get_config() -> RuntimeConfig:
+    """
+    Return the runtime configuration for the current project.
+
+    Resolved on first use, then reused until .env or the config file changes.
+    """
+    root = find_project_root()
+    with _lock:
+        fingerprint = _fingerprint(root)
+        cached = _configs.get(root)
+        if cached is not None and cached[0] == fingerprint:
+            return cached[1]
+        with span("resolve_config"):
+            env = parse_env_file(root / ".env")
+            _apply_env(env)
+            # .env may point at a different config file
+            config_path = config_file_path(root)
+            config = RuntimeConfig(root, env, load_config_file(config_path), config_path)
+            _configs[root] = (_fingerprint(root), config)
+        return config
+
+
+def clear_cache():
+    """Forget every resolved root and configuration."""
+    with _lock:
+        _roots.clear()
+        _configs.clear()
+
+
+def load_api_key() -> Optional[str]:
+    """
+    Load the Gemini API key from environment variables or .env file.
+
+    Returns:
+        The API key if found, None otherwise
+    """
+    return get_config().api_key
+
+
+def setting(
+    env_var: Optional[str],
+    key: str,
+    default: Any = None,
+    cast: Optional[Callable[[Any], Any]] = None,
+    config: Optional[RuntimeConfig] = None,
+) -> Any:
+    """
+    Resolve a setting from the environment, then the config file, then a default.
+
+    Args:
+        env_var: Environment variable that overrides the file (optional)
+        key: Dotted config file key, e.g. concurrency.backfill
+        default: Value used when neither is set
+        cast: Conversion applied to a configured value, e.g. int or float
+        config: Configuration to read (defaults to the current project's)
+
+    Returns:
+        The resolved value
+    """
+    config = config or get_config()
+    value = os.environ.get(env_var, "").strip() if env_var else ""
+    if value == "":
+        value = config.get(key)
+    if value is None or value == "":
+        return default
+    return cast(value) if cast else value
+
+
+#----------------------------------------
+# Command Line Interface
+#----------------------------------------
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Show the resolved runtime configuration")
+    parser.add_argument("--get", metavar="KEY", help="Print one config file value, e.g. models.default")
+    args = parser.parse_args()
+
+    try:
+        config = get_config()
+    except ValueError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+    if args.get:
+        value = config.get(args.get)
+        print(json.dumps(value) if value is not None else "(not set)")
+        sys.exit(0)
+
+    print(f"root          {config.root}")
+    print(f"config file   {config.config_path}{'' if config.config_path.exists() else ' (not found)'}")
+    print(f".env          {', '.join(sorted(config.env)) or '(none)'}")
+    print(f"api key       {'set' if config.api_key else 'not set'}")
+    print(f"default model {config.model() or '(backend default)'}")
+    for name in ("docs_dir", "summary_dir", "notes_dir", "cache_dir", "history_dir"):
+        print(f"{name:<13} {getattr(config, name)}")
+    if config.settings:
+        print(json.dumps(config.settings, indent=2))
@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+"""
+Section Index
+
+Byte-offset index of the headings and code blocks in a research document, so
+agents can read one section ("Error handling", "API endpoints") without loading
+the whole file. The index is written to a <name>.sections.json sidecar when a
+document is saved, and get_section() seeks straight to the requested span.
+
+Compressed documents are decompressed in memory and sliced with the same
+offsets; a document edited after indexing is re-indexed on the next lookup.
+
+Examples:
+    # List the sections of a document
+    python section_index.py .cursor/docs/fastapi_20250101_120000.md --list
+
+    # Print one section, including its subsections
+    python section_index.py .cursor/docs/fastapi_20250101_120000.md "Error handling"
+
+    # Print the third code block
+    python section_index.py .cursor/docs/fastapi_20250101_120000.md --code 3
+"""
+
+import re
+import sys
+import json
+import argparse
+from pathlib import Path
+from typing import Optional, Dict, Any, List
+
+# Ensure the current directory is in the path
+current_dir = Path(__file__).parent
+if str(current_dir) not in sys.path:
+    sys.path.append(str(current_dir))
+
+from tracing import traced
+from artifact_files import ARTIFACT_SUFFIX, read_artifact_bytes, resolve_artifact, sidecar_path
+
+SECTION_INDEX_SUFFIX = ".sections.json"
+INDEX_VERSION = 1
+
+_HEADING_RE = re.compile(rb"^(#{1,6})[ \t]+(.+?)[ \t#]*$")
+_FENCE_RE = re.compile(rb"^[ \t]{0,3}(`{3,}|~{3,})[ \t]*([^`\s]*)")
+
+
+def index_path(path: Path) -> Path:
+    """Return the section index sidecar of a document, whether or not it has been compressed."""
+    return sidecar_path(Path(path), SECTION_INDEX_SUFFIX)
+
+
+def build_index(data: bytes) -> Dict[str, Any]:
+    """
+    Index the headings and fenced code blocks of a markdown document.
+
+    A heading's span runs to the next heading of the same or a higher level, so
+    it includes its subsections. Lines inside code blocks are never headings.
+
+    Args:
+        data: The document as UTF-8 bytes
+
+    Returns:
+        The index, with byte offsets into the uncompressed document
+    """
+    headings: List[Dict[str, Any]] = []
+    code_blocks: List[Dict[str, Any]] = []
+    fence = None
+    open_block = None
+    offset = 0
+    for line_number, line in enumerate(data.splitlines(keepends=True), 1):
+        stripped = line.rstrip(b"\r\n")
+        fence_match = _FENCE_RE.match(stripped)
+        if fence is None and fence_match:
+            fence = fence_match.group(1)
+            open_block = {
+                'language': fence_match.group(2).decode("utf-8", "replace"),
+                'start': offset,
+                'line': line_number,
+                'heading': headings[-1]['title'] if headings else None,
+            }
+        elif fence is not None:
+            if fence_match and fence_match.group(1).startswith(fence) and not fence_match.group(2):
+                open_block['end'] = offset + len(line)
+                code_blocks.append(open_block)
+                fence = open_block = None
+        else:
+            heading_match = _HEADING_RE.match(stripped)
+            if heading_match:
+                level = len(heading_match.group(1))
+                # Close the spans this heading ends
+                for previous in headings:
+                    if previous['end'] is None and previous['level'] >= level:
+                        previous['end'] = offset
+                headings.append({
+                    'title': heading_match.group(2).decode("utf-8", "replace").strip(),
+                    'level': level,
+                    'start': offset,
+                    'end': None,
+                    'line': line_number,
+                })
+        offset += len(line)
+
+    # An unterminated block runs to the end of the document
+    if open_block is not None:
+        open_block['end'] = offset
+        code_blocks.append(open_block)
+    for heading in headings:
+        if heading['end'] is None:
+            heading['end'] = offset
+    return {'version': INDEX_VERSION, 'size': len(data), 'headings': headings, 'code_blocks': code_blocks}
+
+
+@traced()
+def write_index(path: Path, data: Optional[bytes] = None) -> Path:
+    """
+    Write the section index sidecar for a document.
+
+    Args:
+        path: The markdown document
+        data: The document's bytes, if already in memory
+
+    Returns:
+        Path of the sidecar
+    """
+    path = Path(path)
+    if data is None:
+        data = read_artifact_bytes(path)
+    index = build_index(data)
+    if path.name.endswith(ARTIFACT_SUFFIX):
+        # Lets lookups notice edits made after indexing
+        index['mtime'] = path.stat().st_mtime
+    target = index_path(path)
+    with open(target, "w", encoding="utf-8") as f:
+        json.dump(index, f)
+    return target
+
+
+def load_index(path: Path) -> Dict[str, Any]:
+    """
+    Load a document's section index, rebuilding it if it is missing or stale.
+
+    Args:
+        path: The document (the original .md path also finds a compressed copy)
+
+    Returns:
+        The section index
+    """
+    resolved = resolve_artifact(Path(path))
+    if resolved is None:
+        raise FileNotFoundError(f"Document not found: {path}")
+    try:
+        with open(index_path(resolved), "r", encoding="utf-8") as f:
+            index = json.load(f)
+        stale = index.get('version') != INDEX_VERSION
+        if resolved.name.endswith(ARTIFACT_SUFFIX):
+            stat = resolved.stat()
+            stale = stale or index.get('size') != stat.st_size or index.get('mtime') != stat.st_mtime
+        if not stale:
+            return index
+    except (OSError, ValueError):
+        pass
+    write_index(resolved)
+    with open(index_path(resolved), "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _read_span(path: Path, start: int, end: int) -> str:
+    """Read a byte span, seeking in plain files and slicing compressed ones."""
+    if path.name.endswith(ARTIFACT_SUFFIX):
+        with open(path, "rb") as f:
+            f.seek(start)
+            return f.read(end - start).decode("utf-8", "replace")
+    return read_artifact_bytes(path)[start:end].decode("utf-8", "replace")
+
+
+def _normalize(title: str) -> str:
+    return " ".join(re.sub(r"[^\w\s]", " ", title.lower()).split())
+
+
+def find_heading(index: Dict[str, Any], heading: str) -> Optional[Dict[str, Any]]:
+    """
+    Find a heading in an index: exact title first, then ignoring case and
+    punctuation, then the first title containing the text.
+    """
+    headings = index['headings']
+    for entry in headings:
+        if entry['title'] == heading:
+            return entry
+    wanted = _normalize(heading)
+    for entry in headings:
+        if _normalize(entry['title']) == wanted:
+            return entry
+    for entry in headings:
+        if wanted and wanted in _normalize(entry['title']):
+            return entry
+    return None
+
+
+@traced()
+def get_section(path: Path, heading: str) -> str:
+    """
+    Read one section of a document without loading the rest of it.
+
+    Args:
+        path: The document (compressed documents are found from the .md path)
+        heading: Heading title, matched exactly, then loosely
+
+    Returns:
+        The section, from its heading line to the next heading of the same or
+        a higher level
+
+    Raises:
+        FileNotFoundError: The document does not exist
+        KeyError: No heading matches
+    """
+    index = load_index(path)
+    entry = find_heading(index, heading)
+    if entry is None:
+        titles = ", ".join(h['title'] for h in index['headings'][:20])
+        raise KeyError(f"No section matching '{heading}'. Sections: {titles}")
+    return _read_span(resolve_artifact(Path(path)), entry['start'], entry['end'])
+
+
+def get_code_block(path: Path, number: int) -> str:
+    """
+    Read the Nth fenced code block (1-based) of a document, fences included.
+
+    Raises:
+        FileNotFoundError: The document does not exist
+        KeyError: The document has fewer code blocks
+    """
+    index = load_index(path)
+    blocks = index['code_blocks']
+    if not 1 <= number <= len(blocks):
+        raise KeyError(f"Code block {number} not found; the document has {len(blocks)}")
+    block = blocks[number - 1]
+    return _read_span(resolve_artifact(Path(path)), block['start'], block['end'])
+
+
+#----------------------------------------
+# Command Line Interface
+#----------------------------------------
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Read sections of research documents by heading")
+    parser.add_argument("path", help="Research document, e.g. .cursor/docs/topic_20250101_120000.md")
+    parser.add_argument("heading", nargs="?", help="Heading of the section to print")
+    parser.add_argument("--list", "-l", action="store_true", help="List headings and code blocks")
+    parser.add_argument("--code", "-c", type=int, metavar="N", help="Print the Nth code block")
+    args = parser.parse_args()
+
+    try:
+        if args.code is not None:
+            print(get_code_block(Path(args.path), args.code))
+        elif args.heading and not args.list:
+            print(get_section(Path(args.path), args.heading))
+        else:
+            index = load_index(Path(args.path))
+            for entry in index['headings']:
+                size = entry['end'] - entry['start']
+                print(f"{'  ' * (entry['level'] - 1)}{entry['title']}  ({size} bytes, line {entry['line']})")
+            for number, block in enumerate(index['code_blocks'], 1):
+                print(f"code {number}: {block['language'] or 'text'} at line {block['line']} "
+                      f"({block['end'] - block['start']} bytes) under {block['heading'] or '(top)'}")
+    except (FileNotFoundError, KeyError) as e:
+        print(f"Error: {e.args[0] if e.args else e}")
+        sys.exit(1)
@@ -0,0 +1,428 @@
+#!/usr/bin/env python3
+"""
+SpecStory Parser
+
+Streaming parser that turns a SpecStory markdown history file into a compact list
+of messages. Each message holds its role, timestamp, byte span in the file and
+the byte spans of its code blocks and tool output. Text is read back lazily with
+seek(), so callers can pick, compact or chunk messages without loading whole
+histories.
+
+Parsed results are cached in .cursor/cache/specstory/ in a small binary format
+keyed by (path, size, mtime), so re-opening an unchanged history is a single
+file read.
+
+Examples:
+    # List the messages in a history file
+    python specstory_parser.py .specstory/history/2025-04-01_10-00-session.md
+
+    # Print a compact transcript without tool output
+    python specstory_parser.py .specstory/history/2025-04-01_10-00-session.md --transcript
+"""
+
+import os
+import re
+import sys
+import struct
+import hashlib
+import argparse
+from pathlib import Path
+from typing import Optional, List, Tuple, Iterable, Sequence, Sized, BinaryIO
+
+# Ensure the current directory is in the path
+current_dir = Path(__file__).parent
+if str(current_dir) not in sys.path:
+    sys.path.append(str(current_dir))
+
+from tracing import traced
+from runtime_config import get_config
+
+ROLES = ("header", "user", "assistant")
+
+CACHE_MAGIC = b"SSPC"
+CACHE_VERSION = 2
+
+# Role markers: _**User**_, _**Assistant**_, _**User (2025-06-01 10:00Z)**_, _**Agent (model x, mode y)**_
+_ROLE_RE = re.compile(rb"^_\*\*(User|Assistant|Agent)(?:\s*\((.*?)\))?\*\*_\s*$")
+# Session headers carry the session start time: "# Title (2025-03-25 14:32:10Z)"
+_HEADER_TS_RE = re.compile(rb"^#+ .*\((\d{4}-\d{2}-\d{2}[ T]\d{2}:\d{2}(?::\d{2})?Z?)\)\s*$")
+_TIMESTAMP_RE = re.compile(rb"\d{4}-\d{2}-\d{2}[ T]\d{2}:\d{2}(?::\d{2})?Z?")
+_FENCE_RE = re.compile(rb"^\s*(```|~~~)\s*([\w.+-]*)")
+_TOOL_OPEN_RE = re.compile(rb"^\s*<(details|tool-use)[\s>]")
+_TOOL_CLOSE_RE = re.compile(rb"</(details|tool-use)>\s*$")
+
+# Cache layout: header, then fixed-size message, code block and tool block tables,
+# then NUL-separated timestamp and language string tables
+_HEADER_STRUCT = struct.Struct("<4sHQQIIIII")
+_MESSAGE_STRUCT = struct.Struct("<BQQIIIII")
+_CODE_STRUCT = struct.Struct("<QQI")
+_TOOL_STRUCT = struct.Struct("<QQ")
+
+
+class Message:
+    """A single message in a history file, located by byte offsets."""
+
+    __slots__ = ("role", "timestamp", "start", "end", "code_blocks", "tool_blocks")
+
+    def __init__(
+        self,
+        role: str,
+        timestamp: Optional[str],
+        start: int,
+        end: int,
+        code_blocks: Optional[List[Tuple[int, int, str]]] = None,
+        tool_blocks: Optional[List[Tuple[int, int]]] = None,
+    ):
+        self.role = role
+        self.timestamp = timestamp
+        self.start = start
+        self.end = end
+        self.code_blocks = code_blocks or []
+        self.tool_blocks = tool_blocks or []
+
+    @property
+    def size(self) -> int:
+        return self.end - self.start
+
+    def __repr__(self):
+        return (f"Message({self.role!r}, {self.timestamp!r}, {self.start}-{self.end}, "
+                f"code={len(self.code_blocks)}, tools={len(self.tool_blocks)})")
+
+
+#----------------------------------------
+# Parsing
+#----------------------------------------
+
+@traced()
+def parse_history(path: Path) -> List[Message]:
+    """
+    Parse a SpecStory history file line by line.
+
+    Args:
+        path: Path to the history markdown file
+
+    Returns:
+        Messages in file order; text before the first role marker is a "header" message
+    """
+    messages: List[Message] = []
+    current = Message("header", None, 0, 0)
+    session_ts: Optional[str] = None
+    fence: Optional[Tuple[bytes, int, str]] = None
+    tool_start: Optional[int] = None
+    tool_depth = 0
+    offset = 0
+
+    def finish(message: Message, end: int):
+        message.end = end
+        if message.role != "header" or end > message.start:
+            messages.append(message)
+
+    with open(path, "rb") as f:
+        for line in f:
+            line_start = offset
+            offset += len(line)
+            stripped = line.rstrip(b"\r\n")
+
+            # Inside a code fence only the closing fence matters
+            if fence is not None:
+                if stripped.strip().startswith(fence[0]) and not stripped.strip()[len(fence[0]):].strip():
+                    current.code_blocks.append((fence[1], offset, fence[2]))
+                    fence = None
+                continue
+
+            role_match = _ROLE_RE.match(stripped)
+            if role_match:
+                if tool_start is not None:
+                    current.tool_blocks.append((tool_start, line_start))
+                    tool_start, tool_depth = None, 0
+                finish(current, line_start)
+                role = "user" if role_match.group(1) == b"User" else "assistant"
+                timestamp = session_ts
+                if role_match.group(2):
+                    ts_match = _TIMESTAMP_RE.search(role_match.group(2))
+                    if ts_match:
+                        timestamp = ts_match.group(0).decode("ascii")
+                current = Message(role, timestamp, line_start, line_start)
+                continue
+
+            header_match = _HEADER_TS_RE.match(stripped)
+            if header_match:
+                session_ts = header_match.group(1).decode("ascii")
+                if current.role == "header" and current.timestamp is None:
+                    current.timestamp = session_ts
+
+            fence_match = _FENCE_RE.match(stripped)
+            if fence_match and tool_start is None:
+                fence = (fence_match.group(1), line_start, fence_match.group(2).decode("utf-8", "replace"))
+                continue
+
+            if _TOOL_OPEN_RE.match(stripped):
+                if tool_start is None:
+                    tool_start = line_start
+                tool_depth += 1
+            if tool_start is not None and _TOOL_CLOSE_RE.search(stripped):
+                tool_depth -= 1
+                if tool_depth <= 0:
+                    current.tool_blocks.append((tool_start, offset))
+                    tool_start, tool_depth = None, 0
+
+    # Close anything left open at end of file
+    if fence is not None:
+        current.code_blocks.append((fence[1], offset, fence[2]))
+    if tool_start is not None:
+        current.tool_blocks.append((tool_start, offset))
+    finish(current, offset)
+    return messages
+
+
+#----------------------------------------
+# Binary Cache
+#----------------------------------------
+
+def _cache_path(path: Path, cache_dir: Path) -> Path:
+    digest = hashlib.sha1(str(Path(path).resolve()).encode("utf-8")).hexdigest()
+    return Path(cache_dir) / f"{digest}.bin"
+
+
+def _encode(messages: List[Message], size: int, mtime_ns: int) -> bytes:
+    strings = {"": 0}
+    string_list = [""]
+
+    def intern(value: Optional[str]) -> int:
+        value = value or ""
+        if value not in strings:
+            strings[value] = len(string_list)
+            string_list.append(value)
+        return strings[value]
+
+    message_rows, code_rows, tool_rows = [], [], []
+    for m in messages:
+        message_rows.append(_MESSAGE_STRUCT.pack(
+            ROLES.index(m.role), m.start, m.end,
+            len(code_rows), len(m.code_blocks), len(tool_rows), len(m.tool_blocks),
+            intern(m.timestamp),
+        ))
+        code_rows.extend(_CODE_STRUCT.pack(start, end, intern(lang)) for start, end, lang in m.code_blocks)
+        tool_rows.extend(_TOOL_STRUCT.pack(start, end) for start, end in m.tool_blocks)
+
+    string_table = "\0".join(string_list).encode("utf-8")
+    header = _HEADER_STRUCT.pack(CACHE_MAGIC, CACHE_VERSION, size, mtime_ns, len(message_rows),
+                                 len(code_rows), len(tool_rows), len(string_list), len(string_table))
+    return b"".join([header] + message_rows + code_rows + tool_rows + [string_table])
+
+
+class CachedMessages(Sequence):
+    """
+    Read-only sequence of messages backed by a cache file's bytes.
+
+    Rows are decoded on access, so opening a cached history costs one file read
+    regardless of how many messages it holds.
+    """
+
+    def __init__(self, data: bytes, n_messages: int, n_code: int, n_tool: int, strings: List[Optional[str]]):
+        self._data = data
+        self._count = n_messages
+        self._messages_at = _HEADER_STRUCT.size
+        self._codes_at = self._messages_at + n_messages * _MESSAGE_STRUCT.size
+        self._tools_at = self._codes_at + n_code * _CODE_STRUCT.size
+        self._strings = strings
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _decode_row(self, index: int) -> Message:
+        role, start, end, code_first, code_count, tool_first, tool_count, ts = _MESSAGE_STRUCT.unpack_from(
+            self._data, self._messages_at + index * _MESSAGE_STRUCT.size)
+        code_blocks = []
+        for i in range(code_first, code_first + code_count):
+            c_start, c_end, lang = _CODE_STRUCT.unpack_from(self._data, self._codes_at + i * _CODE_STRUCT.size)
+            code_blocks.append((c_start, c_end, self._strings[lang] or ""))
+        tool_blocks = [
+            _TOOL_STRUCT.unpack_from(self._data, self._tools_at + i * _TOOL_STRUCT.size)
+            for i in range(tool_first, tool_first + tool_count)
+        ]
+        return Message(ROLES[role], self._strings[ts], start, end, code_blocks, tool_blocks)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._decode_row(i) for i in range(*index.indices(self._count))]
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError("message index out of range")
+        return self._decode_row(index)
+
+
+def _decode(data: bytes, size: int, mtime_ns: int) -> Optional[CachedMessages]:
+    """Open cached messages, or return None if the cache is stale or unreadable."""
+    if len(data) < _HEADER_STRUCT.size:
+        return None
+    (magic, version, cached_size, cached_mtime, n_messages,
+     n_code, n_tool, n_strings, string_bytes) = _HEADER_STRUCT.unpack_from(data, 0)
+    if magic != CACHE_MAGIC or version != CACHE_VERSION or cached_size != size or cached_mtime != mtime_ns:
+        return None
+
+    tables_end = (_HEADER_STRUCT.size + n_messages * _MESSAGE_STRUCT.size
+                  + n_code * _CODE_STRUCT.size + n_tool * _TOOL_STRUCT.size)
+    if len(data) != tables_end + string_bytes:
+        return None
+    strings: List[Optional[str]] = data[tables_end:].decode("utf-8").split("\0")
+    if len(strings) != n_strings:
+        return None
+    strings[0] = None
+    return CachedMessages(data, n_messages, n_code, n_tool, strings)
+
+
+@traced()
+def load_messages(path: Path, cache_dir: Optional[Path] = None) -> Sequence[Message]:
+    """
+    Return the parsed messages of a history file, using the binary cache when fresh.
+
+    Args:
+        path: Path to the history markdown file
+        cache_dir: Cache directory (no caching when None)
+
+    Returns:
+        Messages in file order (a lazily decoded sequence when served from the cache)
+    """
+    stat = os.stat(path)
+    cache_file = _cache_path(path, cache_dir) if cache_dir else None
+    if cache_file is not None:
+        try:
+            cached = _decode(cache_file.read_bytes(), stat.st_size, stat.st_mtime_ns)
+        except (OSError, struct.error, UnicodeDecodeError, ValueError):
+            cached = None
+        if cached is not None:
+            return cached
+
+    messages = parse_history(path)
+
+    if cache_file is not None:
+        try:
+            cache_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp = cache_file.with_name(cache_file.name + f".{os.getpid()}.tmp")
+            tmp.write_bytes(_encode(messages, stat.st_size, stat.st_mtime_ns))
+            os.replace(tmp, cache_file)
+        except OSError:
+            pass
+    return messages
+
+
+#----------------------------------------
+# Reading Messages
+#----------------------------------------
+
+def read_span(path: Path, start: int, end: int) -> str:
+    """Read a byte span of a file as text."""
+    with open(path, "rb") as f:
+        f.seek(start)
+        return f.read(end - start).decode("utf-8", "replace")
+
+
+def message_text(path: Path, message: Message, include_tool_output: bool = True) -> str:
+    """
+    Read the body of a message, without its role marker and trailing separator.
+
+    Args:
+        path: Path to the history file
+        message: The message to read
+        include_tool_output: If False, tool output blocks are left out
+
+    Returns:
+        The message text
+    """
+    with open(path, "rb") as f:
+        return _read_message_text(f, message, include_tool_output)
+
+
+def _read_message_text(f: BinaryIO, message: Message, include_tool_output: bool) -> str:
+    """Read the body of a message from an open history file."""
+    f.seek(message.start)
+    data = f.read(message.size)
+    if not include_tool_output and message.tool_blocks:
+        kept = []
+        pos = message.start
+        for start, end in message.tool_blocks:
+            kept.append(data[pos - message.start:start - message.start])
+            pos = end
+        kept.append(data[pos - message.start:])
+        data = b"".join(kept)
+    text = data.decode("utf-8", "replace")
+    if message.role != "header":
+        # Drop the role marker line
+        text = text.split("\n", 1)[1] if "\n" in text else ""
+    text = text.strip()
+    if text.endswith("---"):
+        text = text[:-3].rstrip()
+    return text
+
+
+def render_transcript(
+    path: Path,
+    messages: Iterable[Message],
+    max_chars: Optional[int] = None,
+    include_tool_output: bool = False,
+) -> str:
+    """
+    Render messages as a compact transcript, stopping at a character budget.
+
+    Args:
+        path: Path to the history file
+        messages: Messages to include, in order
+        max_chars: Character budget (unlimited when None)
+        include_tool_output: Whether to keep tool output blocks
+
+    Returns:
+        The transcript text, with a truncation note when the budget was hit
+    """
+    parts = []
+    used = 0
+    # Cached messages are decoded lazily, so only generators need materializing for the count
+    if not isinstance(messages, Sized):
+        messages = list(messages)
+    with open(path, "rb") as f:
+        for index, message in enumerate(messages):
+            text = _read_message_text(f, message, include_tool_output)
+            if not text:
+                continue
+            label = message.role.capitalize()
+            if message.timestamp and message.role != "header":
+                label += f" ({message.timestamp})"
+            block = text if message.role == "header" else f"**{label}**:\n{text}"
+            if max_chars is not None and used + len(block) > max_chars:
+                remaining = max_chars - used
+                if remaining > 0:
+                    parts.append(block[:remaining])
+                parts.append(f"[...truncated - {len(messages) - index} of {len(messages)} messages not shown]")
+                break
+            parts.append(block)
+            used += len(block) + 2
+    return "\n\n".join(parts)
+
+
+#----------------------------------------
+# Command Line Interface
+#----------------------------------------
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Parse SpecStory history files")
+    parser.add_argument("path", help="History markdown file")
+    parser.add_argument("--transcript", action="store_true", help="Print a compact transcript")
+    parser.add_argument("--max-chars", type=int, help="Character budget for --transcript")
+    parser.add_argument("--tool-output", action="store_true", help="Keep tool output in --transcript")
+    parser.add_argument("--no-cache", action="store_true", help="Parse without the binary cache")
+    args = parser.parse_args()
+
+    if not Path(args.path).is_file():
+        print(f"File not found: {args.path}")
+        sys.exit(1)
+
+    cache_dir = None if args.no_cache else get_config().cache_dir / "specstory"
+    parsed = load_messages(Path(args.path), cache_dir=cache_dir)
+    if args.transcript:
+        print(render_transcript(Path(args.path), parsed, max_chars=args.max_chars,
+                                include_tool_output=args.tool_output))
+    else:
+        for m in parsed:
+            print(f"{m.role:<10} {m.timestamp or '-':<20} {m.start:>10}-{m.end:<10} "
+                  f"code={len(m.code_blocks)} tools={len(m.tool_blocks)}")
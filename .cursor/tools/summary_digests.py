@@ -0,0 +1,295 @@
+#!/usr/bin/env python3
+"""
+Summary Digests
+
+Precomputed, shorter tiers of each chat summary so new agent sessions don't
+have to load the whole thing. When a summary is written, a short digest (about
+200 tokens) and a medium digest (about 800 tokens) are generated once and saved
+in a <name>.digests.json sidecar next to the markdown file, and in the store
+when it is enabled. Readers pick a tier: short, medium or full.
+
+Digests are extractive by default: the overview paragraph plus the leading
+points of every section, filled breadth-first until the token budget is used.
+Set CURSOR_TOOLS_DIGESTS=model to have the reduce backend write them instead
+(falling back to extraction if generation fails).
+
+Examples:
+    # Print the short digest of a summary
+    python summary_digests.py .cursor/chat_summary/chat_summary_20250101_120000.md
+
+    # Print the medium digest
+    python summary_digests.py .cursor/chat_summary/chat_summary_20250101_120000.md --tier medium
+
+    # Generate digests for summaries written before digests existed
+    python summary_digests.py --rebuild .cursor/chat_summary
+"""
+
+import re
+import sys
+import json
+import argparse
+from pathlib import Path
+from typing import Optional, Dict, Callable, List, Tuple
+
+# Ensure the current directory is in the path
+current_dir = Path(__file__).parent
+if str(current_dir) not in sys.path:
+    sys.path.append(str(current_dir))
+
+from tracing import traced
+from artifact_files import list_artifacts, read_artifact, sidecar_path
+from summary_store import open_store
+from runtime_config import find_project_root, get_config, setting
+
+TIERS = ("short", "medium", "full")
+DIGEST_TIERS = ("short", "medium")
+DEFAULT_TIER = "short"
+DIGEST_SUFFIX = ".digests.json"
+
+# Approximate token budgets of the digest tiers
+DEFAULT_DIGEST_TOKENS = {'short': 200, 'medium': 800}
+
+# Rough characters per token for English markdown
+CHARS_PER_TOKEN = 4
+
+_HEADING_RE = re.compile(r"^(#{1,6}\s+\S.*|\*\*[^*]+\*\*:?)$")
+_LIST_ITEM_RE = re.compile(r"^([-*+]|\d+[.)])\s+")
+
+
+def estimate_tokens(text: str) -> int:
+    """Return a rough token count for text."""
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def digest_budgets() -> Dict[str, int]:
+    """
+    Return the token budget of each digest tier.
+
+    Reads CURSOR_TOOLS_DIGEST_SHORT_TOKENS and CURSOR_TOOLS_DIGEST_MEDIUM_TOKENS,
+    or digests.short_tokens and digests.medium_tokens in the config file.
+    """
+    return {
+        tier: setting(f"CURSOR_TOOLS_DIGEST_{tier.upper()}_TOKENS", f"digests.{tier}_tokens", default, int)
+        for tier, default in DEFAULT_DIGEST_TOKENS.items()
+    }
+
+
+def startup_tier() -> str:
+    """Return the tier printed at startup (CURSOR_TOOLS_STARTUP_TIER, default short)."""
+    tier = str(setting("CURSOR_TOOLS_STARTUP_TIER", "digests.startup_tier", "")).strip().lower()
+    return tier if tier in TIERS else DEFAULT_TIER
+
+
+def digest_mode() -> str:
+    """Return how digests are generated: extractive (default) or model."""
+    mode = str(setting("CURSOR_TOOLS_DIGESTS", "digests.mode", "")).strip().lower()
+    return "model" if mode == "model" else "extractive"
+
+
+def _sections(summary: str) -> List[Tuple[Optional[str], List[str]]]:
+    """Split markdown into (heading, items) pairs; text before the first heading has no heading."""
+    sections: List[Tuple[Optional[str], List[str]]] = [(None, [])]
+    paragraph: List[str] = []
+    in_code = False
+
+    def flush():
+        if paragraph:
+            sections[-1][1].append(" ".join(paragraph))
+            paragraph.clear()
+
+    for line in summary.splitlines():
+        stripped = line.strip()
+        if stripped.startswith("```"):
+            # Code blocks are left to the full tier
+            flush()
+            in_code = not in_code
+            continue
+        if in_code:
+            continue
+        if not stripped:
+            flush()
+        elif _HEADING_RE.match(stripped):
+            flush()
+            sections.append((stripped, []))
+        elif _LIST_ITEM_RE.match(stripped):
+            flush()
+            # Nested items are detail for the deeper tiers
+            if len(line) - len(line.lstrip()) < 2:
+                paragraph.append(stripped)
+        elif paragraph:
+            paragraph.append(stripped)
+        elif len(line) - len(line.lstrip()) < 2:
+            paragraph.append(stripped)
+    flush()
+    return sections
+
+
+def _truncate(text: str, limit: int) -> str:
+    """Shorten text to at most limit characters, preferring a sentence boundary."""
+    if len(text) <= limit:
+        return text
+    cut = text[:limit]
+    end = max(cut.rfind(". "), cut.rfind("! "), cut.rfind("? "))
+    if end >= limit // 3:
+        return cut[:end + 1]
+    return cut[:cut.rfind(" ")].rstrip(",;:") + "..." if " " in cut else cut
+
+
+def extract_digest(summary: str, max_tokens: int) -> str:
+    """
+    Build an extractive digest of a markdown summary.
+
+    The overview comes first, then each section's items are taken breadth-first
+    (first item of every section, then the second, ...) until the budget is used.
+
+    Args:
+        summary: The full summary
+        max_tokens: Approximate token budget
+
+    Returns:
+        The digest, in the summary's original order
+    """
+    budget = max_tokens * CHARS_PER_TOKEN
+    summary = summary.strip()
+    if len(summary) <= budget:
+        return summary
+
+    sections = _sections(summary)
+    overview = next((i for i, (_, items) in enumerate(sections) if items), 0)
+    chosen: List[List[str]] = [[] for _ in sections]
+    used = 0
+    depth = 0
+    while True:
+        progress = False
+        for index, (heading, items) in enumerate(sections):
+            if depth >= len(items):
+                continue
+            # The overview paragraph may use half the budget, other items a fifth
+            item = _truncate(items[depth], budget // 2 if (index, depth) == (overview, 0) else budget // 5)
+            cost = len(item) + 2
+            if heading and not chosen[index]:
+                cost += len(heading) + 2
+            if used + cost > budget:
+                continue
+            chosen[index].append(item)
+            used += cost
+            progress = True
+        depth += 1
+        if not progress and all(depth >= len(items) for _, items in sections):
+            break
+
+    blocks = []
+    for (heading, _), items in zip(sections, chosen):
+        if not items:
+            continue
+        if heading:
+            blocks.append(heading)
+        list_run = [item for item in items if _LIST_ITEM_RE.match(item)]
+        if len(list_run) == len(items):
+            blocks.append("\n".join(items))
+        else:
+            blocks.extend(items)
+    return "\n\n".join(blocks)
+
+
+@traced()
+def build_digests(
+    summary: str,
+    generate: Optional[Callable[[str, int], str]] = None,
+    debug: bool = False,
+) -> Dict[str, str]:
+    """
+    Generate the digest tiers of a summary.
+
+    Args:
+        summary: The full summary
+        generate: Optional function (summary, max_tokens) -> digest used instead
+            of extraction; extraction is used if it fails or returns nothing
+        debug: Whether to print debug messages
+
+    Returns:
+        Digests keyed by tier (short, medium)
+    """
+    digests = {}
+    for tier, max_tokens in digest_budgets().items():
+        digest = ""
+        if generate is not None and estimate_tokens(summary) > max_tokens:
+            try:
+                digest = generate(summary, max_tokens).strip()
+            except Exception as e:
+                if debug:
+                    print(f"DEBUG: Generating {tier} digest failed, extracting instead: {e}")
+        digests[tier] = digest or extract_digest(summary, max_tokens)
+        if debug:
+            print(f"DEBUG: {tier} digest: ~{estimate_tokens(digests[tier])} tokens")
+    return digests
+
+
+def digest_path(summary_path: Path) -> Path:
+    """Return the digest sidecar of a summary, whether or not it has been compressed."""
+    return sidecar_path(Path(summary_path), DIGEST_SUFFIX)
+
+
+def write_digests(summary_path: Path, digests: Dict[str, str]) -> Path:
+    """Write digests to the sidecar next to a summary."""
+    path = digest_path(summary_path)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(digests, f, indent=2)
+    return path
+
+
+def read_tier(summary_path: Path, tier: str = DEFAULT_TIER) -> Tuple[str, str]:
+    """
+    Read one tier of a summary.
+
+    Args:
+        summary_path: The summary artifact (compressed or not)
+        tier: short, medium or full
+
+    Returns:
+        The text and the tier actually returned; summaries without digests
+        fall back to the full text
+    """
+    if tier != "full":
+        try:
+            with open(digest_path(summary_path), "r", encoding="utf-8") as f:
+                digests = json.load(f)
+            if digests.get(tier):
+                return digests[tier], tier
+        except (OSError, ValueError):
+            pass
+    return read_artifact(Path(summary_path)), "full"
+
+
+#----------------------------------------
+# Command Line Interface
+#----------------------------------------
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Tiered summary digests")
+    parser.add_argument("path", nargs="?", help="Summary file to read, or directory with --rebuild (default: .cursor/chat_summary)")
+    parser.add_argument("--tier", "-t", choices=TIERS, default=DEFAULT_TIER, help="Tier to print (default: short)")
+    parser.add_argument("--rebuild", action="store_true",
+                        help="Write digests for every summary in the directory that has none")
+    args = parser.parse_args()
+
+    if args.rebuild:
+        directory = Path(args.path) if args.path else get_config().summary_dir
+        written = 0
+        for artifact in list_artifacts(directory):
+            if not digest_path(artifact).exists():
+                write_digests(artifact, build_digests(read_artifact(artifact)))
+                written += 1
+        store = open_store(find_project_root())
+        if store:
+            with store:
+                for artifact_id in store.without_digests():
+                    store.set_digests(artifact_id, build_digests(store.get(artifact_id)['content']))
+                    written += 1
+        print(f"Wrote digests for {written} summary file(s) and store record(s)")
+        sys.exit(0)
+
+    if not args.path:
+        parser.error("a summary file is required")
+    text, tier = read_tier(Path(args.path), args.tier)
+    print(f"[{tier}, ~{estimate_tokens(text)} tokens]\n\n{text}")
@@ -0,0 +1,480 @@
+#!/usr/bin/env python3
+"""
+Summary Store
+
+An optional SQLite-backed store for research documents and chat summaries.
+Content is kept zlib-compressed and indexed by kind, topic, query hash, source
+files and creation time, so lookups no longer need to glob and stat the
+.cursor/docs and .cursor/chat_summary directories. Markdown files are still
+exported next to the store for humans to read.
+
+Enable it by setting CURSOR_TOOLS_STORE=sqlite (or 1/true) in the environment.
+
+Examples:
+    # Show the newest stored chat summaries
+    python summary_store.py --list --kind chat_summary
+
+    # Apply the retention policy now
+    python summary_store.py --prune --max-age-days 30 --max-count 200
+"""
+
+import sys
+import time
+import json
+import zlib
+import sqlite3
+import hashlib
+import argparse
+from pathlib import Path
+from typing import Optional, Dict, Any, Iterable, List
+
+# Ensure the current directory is in the path
+current_dir = Path(__file__).parent
+if str(current_dir) not in sys.path:
+    sys.path.append(str(current_dir))
+
+from artifact_files import SIDECAR_SUFFIXES, sidecar_path
+from runtime_config import get_config, setting
+
+STORE_ENV_VAR = "CURSOR_TOOLS_STORE"
+STORE_FILENAME = "store.sqlite3"
+
+# Artifact kinds written by the tools
+KIND_RESEARCH = "research"
+KIND_CHAT_SUMMARY = "chat_summary"
+KIND_MULTI_CHAT_SUMMARY = "multi_chat_summary"
+KIND_SESSION_SUMMARY = "session_summary"
+SUMMARY_KINDS = (KIND_CHAT_SUMMARY, KIND_MULTI_CHAT_SUMMARY)
+# Kinds kept regardless of max_count: one session summary per history file is the backfill's output
+COUNT_RETENTION_EXEMPT_KINDS = (KIND_SESSION_SUMMARY,)
+
+# Directories next to the store whose exports are managed by the tools; files
+# exported anywhere else were chosen by the caller and are never deleted
+MANAGED_EXPORT_DIRS = ("docs", "chat_summary")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS artifacts (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    kind TEXT NOT NULL,
+    topic TEXT,
+    query_hash TEXT,
+    created_at REAL NOT NULL,
+    export_path TEXT,
+    size INTEGER NOT NULL,
+    content BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_artifacts_kind_created ON artifacts (kind, created_at);
+CREATE INDEX IF NOT EXISTS idx_artifacts_query_hash ON artifacts (query_hash, created_at);
+CREATE INDEX IF NOT EXISTS idx_artifacts_topic ON artifacts (topic);
+CREATE INDEX IF NOT EXISTS idx_artifacts_created ON artifacts (created_at);
+
+CREATE TABLE IF NOT EXISTS artifact_sources (
+    artifact_id INTEGER NOT NULL REFERENCES artifacts (id) ON DELETE CASCADE,
+    source_path TEXT NOT NULL,
+    PRIMARY KEY (artifact_id, source_path)
+);
+CREATE INDEX IF NOT EXISTS idx_artifact_sources_path ON artifact_sources (source_path);
+"""
+
+# Columns added after the first release, applied to existing databases on open
+MIGRATIONS = [
+    ("artifact_sources", "content_hash", "TEXT",
+     "CREATE INDEX IF NOT EXISTS idx_artifact_sources_hash ON artifact_sources (content_hash)"),
+    ("artifacts", "digests", "BLOB", None),
+]
+
+# Columns returned by lookups; content is decompressed separately
+_RECORD_COLUMNS = "id, kind, topic, query_hash, created_at, export_path, size, content"
+
+
+def _pack_digests(digests: Optional[Dict[str, str]]) -> Optional[bytes]:
+    return zlib.compress(json.dumps(digests).encode("utf-8"), 6) if digests else None
+
+
+def _unpack_digests(blob: Optional[bytes]) -> Dict[str, str]:
+    return json.loads(zlib.decompress(blob).decode("utf-8")) if blob else {}
+
+
+def store_enabled() -> bool:
+    """Return True if the SQLite store has been enabled through the environment or config file."""
+    return str(setting(STORE_ENV_VAR, "store.enabled", "")).strip().lower() in ("1", "true", "yes", "sqlite")
+
+
+def query_hash(query: str) -> str:
+    """
+    Hash a research query so equivalent queries map to the same key.
+
+    Args:
+        query: The topic or question
+
+    Returns:
+        A hex SHA-256 digest of the normalized query
+    """
+    normalized = " ".join(query.lower().split())
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+
+class SummaryStore:
+    """Indexed, compressed storage for generated markdown artifacts."""
+
+    def __init__(self, db_path: Path):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(self.db_path))
+        self.conn.execute("PRAGMA foreign_keys = ON")
+        self.conn.execute("PRAGMA journal_mode = WAL")
+        self.conn.executescript(SCHEMA)
+        self._migrate()
+
+    def _migrate(self):
+        for table, column, column_type, index_sql in MIGRATIONS:
+            columns = [row[1] for row in self.conn.execute(f"PRAGMA table_info({table})")]
+            if column not in columns:
+                self.conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {column_type}")
+            if index_sql:
+                self.conn.execute(index_sql)
+        self.conn.commit()
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _to_record(self, row) -> Dict[str, Any]:
+        """Convert a database row into a record dictionary with decompressed content."""
+        artifact_id, kind, topic, q_hash, created_at, export_path, size, blob = row
+        sources = [
+            r[0] for r in self.conn.execute(
+                "SELECT source_path FROM artifact_sources WHERE artifact_id = ? ORDER BY source_path",
+                (artifact_id,),
+            )
+        ]
+        return {
+            'id': artifact_id,
+            'kind': kind,
+            'topic': topic,
+            'query_hash': q_hash,
+            'created_at': created_at,
+            'export_path': export_path,
+            'size': size,
+            'sources': sources,
+            'content': zlib.decompress(blob).decode("utf-8"),
+        }
+
+    def add(
+        self,
+        kind: str,
+        content: str,
+        topic: Optional[str] = None,
+        query: Optional[str] = None,
+        sources: Iterable[Any] = (),
+        export_path: Optional[str] = None,
+        source_hashes: Optional[Dict[str, str]] = None,
+        digests: Optional[Dict[str, str]] = None,
+    ) -> int:
+        """
+        Store a new artifact.
+
+        Args:
+            kind: Artifact kind (research, chat_summary, multi_chat_summary)
+            content: Markdown content
+            topic: Topic or title of the artifact
+            query: Query the artifact answers, hashed for lookups
+            sources: History files the artifact was generated from
+            export_path: Path of the exported markdown copy, if any
+            source_hashes: Content hashes of the source files, keyed by path
+            digests: Shorter versions of the content, keyed by tier
+
+        Returns:
+            The id of the new artifact
+        """
+        data = content.encode("utf-8")
+        with self.conn:
+            cursor = self.conn.execute(
+                "INSERT INTO artifacts (kind, topic, query_hash, created_at, export_path, size, content, digests) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    kind,
+                    topic,
+                    query_hash(query) if query else None,
+                    time.time(),
+                    str(export_path) if export_path else None,
+                    len(data),
+                    zlib.compress(data, 6),
+                    _pack_digests(digests),
+                ),
+            )
+            artifact_id = cursor.lastrowid
+            source_hashes = source_hashes or {}
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO artifact_sources (artifact_id, source_path, content_hash) VALUES (?, ?, ?)",
+                [(artifact_id, str(Path(src).resolve()), source_hashes.get(str(src))) for src in sources],
+            )
+        return artifact_id
+
+    def get(self, artifact_id: int) -> Optional[Dict[str, Any]]:
+        """Return the artifact with the given id, or None."""
+        row = self.conn.execute(
+            f"SELECT {_RECORD_COLUMNS} FROM artifacts WHERE id = ?", (artifact_id,)
+        ).fetchone()
+        return self._to_record(row) if row else None
+
+    def latest(self, kinds: Iterable[str] = SUMMARY_KINDS) -> Optional[Dict[str, Any]]:
+        """
+        Return the newest artifact of the given kinds.
+
+        Args:
+            kinds: Artifact kinds to consider
+
+        Returns:
+            The newest record, or None if the store holds none
+        """
+        kinds = list(kinds)
+        placeholders = ", ".join("?" for _ in kinds)
+        row = self.conn.execute(
+            f"SELECT {_RECORD_COLUMNS} FROM artifacts WHERE kind IN ({placeholders}) "
+            "ORDER BY created_at DESC, id DESC LIMIT 1",
+            kinds,
+        ).fetchone()
+        return self._to_record(row) if row else None
+
+    def latest_digest(self, tier: str, kinds: Iterable[str] = SUMMARY_KINDS) -> Optional[Dict[str, Any]]:
+        """
+        Return one tier of the newest artifact without decompressing its full content.
+
+        Args:
+            tier: Digest tier such as short or medium; full returns the content
+            kinds: Artifact kinds to consider
+
+        Returns:
+            A record with id, export_path, created_at, tier and content, or None.
+            Artifacts stored without digests fall back to the full tier.
+        """
+        kinds = list(kinds)
+        placeholders = ", ".join("?" for _ in kinds)
+        row = self.conn.execute(
+            f"SELECT id, export_path, created_at, digests FROM artifacts WHERE kind IN ({placeholders}) "
+            "ORDER BY created_at DESC, id DESC LIMIT 1",
+            kinds,
+        ).fetchone()
+        if row is None:
+            return None
+        artifact_id, export_path, created_at, blob = row
+        digests = _unpack_digests(blob)
+        if tier in digests:
+            content = digests[tier]
+        else:
+            tier = "full"
+            content = zlib.decompress(self.conn.execute(
+                "SELECT content FROM artifacts WHERE id = ?", (artifact_id,)
+            ).fetchone()[0]).decode("utf-8")
+        return {'id': artifact_id, 'export_path': export_path, 'created_at': created_at,
+                'tier': tier, 'content': content}
+
+    def set_digests(self, artifact_id: int, digests: Dict[str, str]):
+        """Replace the stored digests of an artifact."""
+        with self.conn:
+            self.conn.execute("UPDATE artifacts SET digests = ? WHERE id = ?",
+                              (_pack_digests(digests), artifact_id))
+
+    def without_digests(self, kinds: Iterable[str] = SUMMARY_KINDS) -> List[int]:
+        """Return the ids of artifacts stored before digests were generated."""
+        kinds = list(kinds)
+        placeholders = ", ".join("?" for _ in kinds)
+        return [r[0] for r in self.conn.execute(
+            f"SELECT id FROM artifacts WHERE kind IN ({placeholders}) AND digests IS NULL", kinds
+        )]
+
+    def find_by_query(self, query: str, max_age_seconds: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """
+        Return the newest research artifact for a query.
+
+        Args:
+            query: The topic or question
+            max_age_seconds: Ignore artifacts older than this (optional)
+
+        Returns:
+            The matching record, or None
+        """
+        min_created = time.time() - max_age_seconds if max_age_seconds is not None else 0
+        row = self.conn.execute(
+            f"SELECT {_RECORD_COLUMNS} FROM artifacts WHERE query_hash = ? AND created_at >= ? "
+            "ORDER BY created_at DESC, id DESC LIMIT 1",
+            (query_hash(query), min_created),
+        ).fetchone()
+        return self._to_record(row) if row else None
+
+    def find_by_topic(self, topic: str, limit: int = 10) -> List[Dict[str, Any]]:
+        """Return the newest artifacts whose topic matches exactly."""
+        rows = self.conn.execute(
+            f"SELECT {_RECORD_COLUMNS} FROM artifacts WHERE topic = ? "
+            "ORDER BY created_at DESC, id DESC LIMIT ?",
+            (topic, limit),
+        ).fetchall()
+        return [self._to_record(row) for row in rows]
+
+    def find_by_source(self, source_path: Any) -> List[Dict[str, Any]]:
+        """Return all artifacts generated from the given history file, newest first."""
+        rows = self.conn.execute(
+            f"SELECT {', '.join('a.' + c.strip() for c in _RECORD_COLUMNS.split(','))} "
+            "FROM artifacts a JOIN artifact_sources s ON s.artifact_id = a.id "
+            "WHERE s.source_path = ? ORDER BY a.created_at DESC, a.id DESC",
+            (str(Path(source_path).resolve()),),
+        ).fetchall()
+        return [self._to_record(row) for row in rows]
+
+    def has_source_hash(self, content_hash: str) -> bool:
+        """Return True if an artifact was generated from a source with this content hash."""
+        row = self.conn.execute(
+            "SELECT 1 FROM artifact_sources WHERE content_hash = ? LIMIT 1", (content_hash,)
+        ).fetchone()
+        return row is not None
+
+    def list(self, kinds: Optional[Iterable[str]] = None, limit: int = 20) -> List[Dict[str, Any]]:
+        """Return metadata for the newest artifacts, without content."""
+        sql = "SELECT id, kind, topic, created_at, export_path, size FROM artifacts"
+        params: list = []
+        if kinds:
+            kinds = list(kinds)
+            sql += f" WHERE kind IN ({', '.join('?' for _ in kinds)})"
+            params.extend(kinds)
+        sql += " ORDER BY created_at DESC, id DESC LIMIT ?"
+        params.append(limit)
+        keys = ('id', 'kind', 'topic', 'created_at', 'export_path', 'size')
+        return [dict(zip(keys, row)) for row in self.conn.execute(sql, params)]
+
+    def is_managed_export(self, export_path: Any) -> bool:
+        """Return True if an export lives in a directory the tools manage (.cursor/docs or .cursor/chat_summary)."""
+        path = Path(export_path).resolve()
+        base = self.db_path.resolve().parent
+        return any(path.is_relative_to(base / name) for name in MANAGED_EXPORT_DIRS)
+
+    def prune(
+        self,
+        max_age_days: Optional[float] = None,
+        max_count: Optional[int] = None,
+        delete_exports: bool = True,
+    ) -> int:
+        """
+        Delete artifacts that fall outside the retention policy.
+
+        Args:
+            max_age_days: Delete artifacts older than this many days
+            max_count: Keep at most this many artifacts per kind (session summaries are exempt)
+            delete_exports: Also delete exported markdown files in the managed directories
+
+        Returns:
+            The number of artifacts deleted
+        """
+        doomed = set()
+        if max_age_days is not None:
+            cutoff = time.time() - max_age_days * 86400
+            doomed.update(r[0] for r in self.conn.execute(
+                "SELECT id FROM artifacts WHERE created_at < ?", (cutoff,)
+            ))
+        if max_count is not None:
+            kinds = [r[0] for r in self.conn.execute("SELECT DISTINCT kind FROM artifacts")
+                     if r[0] not in COUNT_RETENTION_EXEMPT_KINDS]
+            for kind in kinds:
+                doomed.update(r[0] for r in self.conn.execute(
+                    "SELECT id FROM artifacts WHERE kind = ? "
+                    "ORDER BY created_at DESC, id DESC LIMIT -1 OFFSET ?",
+                    (kind, max_count),
+                ))
+        if not doomed:
+            return 0
+
+        ids = sorted(doomed)
+        placeholders = ", ".join("?" for _ in ids)
+        if delete_exports:
+            for (export_path,) in self.conn.execute(
+                f"SELECT export_path FROM artifacts WHERE id IN ({placeholders}) AND export_path IS NOT NULL",
+                ids,
+            ).fetchall():
+                if not self.is_managed_export(export_path):
+                    continue
+                # Exports written within the same second share a name with a newer artifact
+                if self.conn.execute(
+                    f"SELECT 1 FROM artifacts WHERE export_path = ? AND id NOT IN ({placeholders}) LIMIT 1",
+                    [export_path] + ids,
+                ).fetchone():
+                    continue
+                # The export may have been compressed by the file retention policy
+                targets = [Path(export_path + suffix) for suffix in ("", ".gz", ".zst")]
+                targets += [sidecar_path(Path(export_path), suffix) for suffix in SIDECAR_SUFFIXES]
+                for target in targets:
+                    try:
+                        target.unlink()
+                    except OSError:
+                        pass
+        with self.conn:
+            self.conn.execute(f"DELETE FROM artifacts WHERE id IN ({placeholders})", ids)
+        return len(ids)
+
+    def apply_retention(self) -> int:
+        """
+        Prune using the configured retention policy.
+
+        Reads CURSOR_TOOLS_STORE_MAX_AGE_DAYS and CURSOR_TOOLS_STORE_MAX_COUNT,
+        or store.max_age_days and store.max_count in the config file.
+
+        Returns:
+            The number of artifacts deleted
+        """
+        max_age = setting("CURSOR_TOOLS_STORE_MAX_AGE_DAYS", "store.max_age_days", cast=float)
+        max_count = setting("CURSOR_TOOLS_STORE_MAX_COUNT", "store.max_count", cast=int)
+        if max_age is None and max_count is None:
+            return 0
+        return self.prune(max_age_days=max_age, max_count=max_count)
+
+
+def open_store(project_root: Path) -> Optional[SummaryStore]:
+    """
+    Open the project's store if it is enabled.
+
+    Args:
+        project_root: The project root containing .cursor
+
+    Returns:
+        A SummaryStore, or None when the store is disabled
+    """
+    if not store_enabled():
+        return None
+    return SummaryStore(Path(project_root) / ".cursor" / STORE_FILENAME)
+
+
+#----------------------------------------
+# Command Line Interface
+#----------------------------------------
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Research and chat summary store")
+    parser.add_argument("--db", help="Path to the store database (default: .cursor/store.sqlite3)")
+    parser.add_argument("--list", action="store_true", help="List the newest artifacts")
+    parser.add_argument("--kind", action="append", help="Restrict --list to an artifact kind")
+    parser.add_argument("--limit", type=int, default=20, help="Number of artifacts to list")
+    parser.add_argument("--prune", action="store_true", help="Apply the retention policy")
+    parser.add_argument("--max-age-days", type=float, help="Delete artifacts older than this")
+    parser.add_argument("--max-count", type=int, help="Keep at most this many artifacts per kind")
+    args = parser.parse_args()
+
+    db_path = Path(args.db) if args.db else get_config().cursor_dir / STORE_FILENAME
+    if not db_path.exists():
+        print(f"Store not found: {db_path}")
+        sys.exit(1)
+
+    with SummaryStore(db_path) as store:
+        if args.prune:
+            if args.max_age_days is None and args.max_count is None:
+                deleted = store.apply_retention()
+            else:
+                deleted = store.prune(max_age_days=args.max_age_days, max_count=args.max_count)
+            print(f"Pruned {deleted} artifact(s)")
+        else:
+            for record in store.list(kinds=args.kind, limit=args.limit):
+                created = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(record['created_at']))
+                print(f"{record['id']:>6}  {created}  {record['kind']:<20} {record['size']:>8}  {record['topic'] or ''}")
@@ -0,0 +1,340 @@
+#!/usr/bin/env python3
+"""
+Tracing and Profiling
+
+Lightweight nested timing spans for the tools, so a slow research or startup
+run shows where the time went: finding the project root, imports, backend
+client setup, context caching and streaming. Spans are off by default and cost
+a single check when disabled.
+
+Set CURSOR_TOOLS_TRACE=jsonl (or 1) to write one JSON line per span, or
+CURSOR_TOOLS_TRACE=chrome to write a Chrome trace that opens in
+chrome://tracing or https://ui.perfetto.dev. Traces are written to
+.cursor/traces/ when the process exits (CURSOR_TOOLS_TRACE_DIR overrides it).
+
+Set CURSOR_TOOLS_PROFILE=cprofile or CURSOR_TOOLS_PROFILE=tracemalloc to
+capture a CPU or memory profile of the whole command into the same directory.
+
+Examples:
+    # Trace a research run
+    CURSOR_TOOLS_TRACE=chrome python research_helper.py "FastAPI"
+
+    # Profile the startup summary
+    CURSOR_TOOLS_PROFILE=cprofile python chat_summary_tool.py
+
+    # Print a span tree from a JSONL trace
+    python tracing.py .cursor/traces/trace_chat_summary_tool_20250101_120000_1234.jsonl
+"""
+
+import os
+import sys
+import json
+import time
+import atexit
+import argparse
+import functools
+import itertools
+import threading
+from pathlib import Path
+from typing import Optional, Dict, Any, List, Callable
+
+TRACE_ENV_VAR = "CURSOR_TOOLS_TRACE"
+PROFILE_ENV_VAR = "CURSOR_TOOLS_PROFILE"
+
+# Traces live in .cursor/traces under the project root
+TRACE_DIRNAME = "traces"
+
+# Number of lines kept in the text reports of profiles
+PROFILE_REPORT_LINES = 40
+
+
+def trace_format() -> Optional[str]:
+    """Return the configured trace format (jsonl or chrome), or None when tracing is off."""
+    value = os.environ.get(TRACE_ENV_VAR, "").strip().lower()
+    if value == "chrome":
+        return "chrome"
+    if value in ("1", "true", "yes", "jsonl"):
+        return "jsonl"
+    return None
+
+
+def trace_dir() -> Path:
+    """Return the directory traces and profiles are written to."""
+    value = os.environ.get("CURSOR_TOOLS_TRACE_DIR", "").strip()
+    if value:
+        return Path(value)
+    # Imported here because runtime_config itself records spans
+    from runtime_config import get_config
+    return get_config().cursor_dir / TRACE_DIRNAME
+
+
+def _output_path(prefix: str, suffix: str) -> Path:
+    """Return a unique output path named after the running command."""
+    command = Path(sys.argv[0]).stem if sys.argv else ""
+    if not command or command.startswith("-"):
+        command = "python"
+    timestamp = time.strftime("%Y%m%d_%H%M%S")
+    directory = trace_dir()
+    directory.mkdir(parents=True, exist_ok=True)
+    return directory / f"{prefix}_{command}_{timestamp}_{os.getpid()}{suffix}"
+
+
+class Span:
+    """A timed operation; use as a context manager and attach attributes with set()."""
+
+    __slots__ = ("tracer", "name", "attrs", "span_id", "parent_id", "thread_id", "start", "end")
+
+    def __init__(self, tracer: "Tracer", name: str, attrs: Dict[str, Any]):
+        self.tracer = tracer
+        self.name = name
+        self.attrs = attrs
+        self.span_id = 0
+        self.parent_id = None
+        self.thread_id = 0
+        self.start = 0.0
+        self.end = 0.0
+
+    def set(self, **attrs):
+        """Attach attributes, e.g. sizes or cache hits, to the span."""
+        self.attrs.update(attrs)
+
+    def __enter__(self) -> "Span":
+        self.tracer.begin(self)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is not None:
+            self.attrs['error'] = exc_type.__name__
+        self.tracer.finish(self)
+        return False
+
+
+class _NullSpan:
+    """Stand-in returned by span() when tracing is off."""
+
+    __slots__ = ()
+
+    def set(self, **attrs):
+        pass
+
+    def __enter__(self) -> "_NullSpan":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class Tracer:
+    """Collects finished spans for one process and exports them."""
+
+    def __init__(self, fmt: str = "jsonl"):
+        self.format = fmt
+        self.spans: List[Span] = []
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._thread_names: Dict[int, str] = {}
+        # perf_counter is precise but has no epoch; remember how to convert it
+        self._epoch_offset = time.time() - time.perf_counter()
+
+    def _stack(self) -> List[Span]:
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def begin(self, span: Span):
+        stack = self._stack()
+        span.span_id = next(self._ids)
+        span.parent_id = stack[-1].span_id if stack else None
+        span.thread_id = threading.get_ident()
+        stack.append(span)
+        span.start = time.perf_counter()
+
+    def finish(self, span: Span):
+        span.end = time.perf_counter()
+        stack = self._stack()
+        # Generators can close spans out of order, so remove rather than pop
+        if span in stack:
+            stack.remove(span)
+        with self._lock:
+            self.spans.append(span)
+            self._thread_names.setdefault(span.thread_id, threading.current_thread().name)
+
+    def records(self) -> List[Dict[str, Any]]:
+        """Return finished spans as dictionaries, in start order."""
+        with self._lock:
+            spans = sorted(self.spans, key=lambda s: s.start)
+        return [{
+            'name': s.name,
+            'id': s.span_id,
+            'parent': s.parent_id,
+            'thread': self._thread_names.get(s.thread_id, str(s.thread_id)),
+            'start': s.start + self._epoch_offset,
+            'duration_ms': round((s.end - s.start) * 1000, 3),
+            'attrs': s.attrs,
+        } for s in spans]
+
+    def export(self, path: Optional[Path] = None) -> Optional[Path]:
+        """
+        Write the finished spans in the configured format.
+
+        Args:
+            path: Output file (defaults to a new file in the trace directory)
+
+        Returns:
+            The path written, or None if there were no spans
+        """
+        records = self.records()
+        if not records:
+            return None
+        if self.format == "chrome":
+            path = Path(path) if path else _output_path("trace", ".json")
+            origin = min(r['start'] for r in records)
+            pid = os.getpid()
+            threads = {}
+            events = []
+            for record in records:
+                tid = threads.setdefault(record['thread'], len(threads) + 1)
+                events.append({
+                    'name': record['name'],
+                    'cat': "cursor-tools",
+                    'ph': "X",
+                    'ts': round((record['start'] - origin) * 1e6, 1),
+                    'dur': round(record['duration_ms'] * 1000, 1),
+                    'pid': pid,
+                    'tid': tid,
+                    'args': record['attrs'],
+                })
+            for name, tid in threads.items():
+                events.append({'name': "thread_name", 'ph': "M", 'pid': pid, 'tid': tid, 'args': {'name': name}})
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump({'traceEvents': events, 'displayTimeUnit': "ms"}, f, default=str)
+        else:
+            path = Path(path) if path else _output_path("trace", ".jsonl")
+            with open(path, "w", encoding="utf-8") as f:
+                for record in records:
+                    f.write(json.dumps(record, default=str) + "\n")
+        return path
+
+
+_tracer: Optional[Tracer] = None
+
+
+def get_tracer() -> Optional[Tracer]:
+    """Return the process tracer, or None when tracing is off."""
+    return _tracer
+
+
+def span(name: str, **attrs):
+    """
+    Time a block of code as a span nested under the current one.
+
+    Args:
+        name: Stage name, e.g. stream or find_project_root
+        **attrs: Attributes recorded with the span
+
+    Returns:
+        A context manager yielding the span (a no-op when tracing is off)
+    """
+    if _tracer is None:
+        return _NULL_SPAN
+    return Span(_tracer, name, attrs)
+
+
+def traced(name: Optional[str] = None) -> Callable:
+    """Decorator that records each call of a function as a span."""
+    def decorator(func):
+        label = name or func.__name__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if _tracer is None:
+                return func(*args, **kwargs)
+            with Span(_tracer, label, {}):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def _export_trace():
+    path = _tracer.export() if _tracer else None
+    if path:
+        print(f"Trace written to: {path}", file=sys.stderr)
+
+
+def _stop_cprofile(profiler):
+    import pstats
+    profiler.disable()
+    path = _output_path("profile", ".prof")
+    profiler.dump_stats(str(path))
+    with open(path.with_suffix(".txt"), "w", encoding="utf-8") as f:
+        stats = pstats.Stats(profiler, stream=f)
+        stats.sort_stats("cumulative").print_stats(PROFILE_REPORT_LINES)
+    print(f"CPU profile written to: {path}", file=sys.stderr)
+
+
+def _stop_tracemalloc():
+    import tracemalloc
+    snapshot = tracemalloc.take_snapshot()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    path = _output_path("memory", ".txt")
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(f"current: {current / 1024:.1f} KiB\npeak: {peak / 1024:.1f} KiB\n\n")
+        for stat in snapshot.statistics("lineno")[:PROFILE_REPORT_LINES]:
+            f.write(f"{stat}\n")
+    print(f"Memory profile written to: {path}", file=sys.stderr)
+
+
+def _configure():
+    """Start tracing and profiling as configured; runs once, when the module is first imported."""
+    global _tracer
+    fmt = trace_format()
+    if fmt:
+        _tracer = Tracer(fmt)
+        atexit.register(_export_trace)
+
+    profile = os.environ.get(PROFILE_ENV_VAR, "").strip().lower()
+    if profile == "cprofile":
+        import cProfile
+        profiler = cProfile.Profile()
+        profiler.enable()
+        atexit.register(_stop_cprofile, profiler)
+    elif profile == "tracemalloc":
+        import tracemalloc
+        tracemalloc.start(25)
+        atexit.register(_stop_tracemalloc)
+
+
+_configure()
+
+
+#----------------------------------------
+# Command Line Interface
+#----------------------------------------
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Show a JSONL trace as a span tree")
+    parser.add_argument("trace", help="Trace file written with CURSOR_TOOLS_TRACE=jsonl")
+    parser.add_argument("--min-ms", type=float, default=0.0, help="Hide spans shorter than this")
+    args = parser.parse_args()
+
+    with open(args.trace, "r", encoding="utf-8") as f:
+        records = [json.loads(line) for line in f if line.strip()]
+    children: Dict[Any, List[Dict[str, Any]]] = {}
+    for record in records:
+        children.setdefault(record['parent'], []).append(record)
+
+    def show(parent, depth):
+        for record in children.get(parent, []):
+            if record['duration_ms'] >= args.min_ms:
+                attrs = " ".join(f"{k}={v}" for k, v in record['attrs'].items())
+                print(f"{'  ' * depth}{record['name']:<{max(1, 40 - 2 * depth)}} "
+                      f"{record['duration_ms']:>10.1f} ms  {attrs}")
+            show(record['id'], depth + 1)
+
+    show(None, 0)